@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useMemo } from 'react';
 // These imports are correct and will work once Recharts is installed via npm/yarn
-import { PieChart, Pie, Cell, ResponsiveContainer, Legend, Tooltip, BarChart, Bar, XAxis, YAxis, CartesianGrid } from 'recharts';
+import { PieChart, Pie, Cell, ResponsiveContainer, Legend, Tooltip, BarChart, Bar, XAxis, YAxis, CartesianGrid, LineChart, Line } from 'recharts';
 
 function ReportsPage() {
   const [allAssets, setAllAssets] = useState([]); // Store all fetched assets
@@ -21,6 +21,10 @@ function ReportsPage() {
   const [locations, setLocations] = useState([]);
   const [users, setUsers] = useState([]);
 
+  // Daily snapshot history for the trend chart
+  const [trendDimension, setTrendDimension] = useState('status');
+  const [trend, setTrend] = useState({ dates: [], series: [] });
+
   const backendUrl = 'http://localhost:5000'; // Your Flask backend URL
 
   // Helper function to format date for display
@@ -87,6 +91,22 @@ function ReportsPage() {
     fetchData();
   }, []); // Run only once on mount
 
+  // Fetch the trend series whenever the chosen dimension changes
+  useEffect(() => {
+    const fetchTrend = async () => {
+      try {
+        const trendRes = await fetch(`${backendUrl}/api/reports/trends?dimension=${trendDimension}`);
+        if (!trendRes.ok) throw new Error(`HTTP error! Trends status: ${trendRes.status}`);
+        setTrend(await trendRes.json());
+      } catch (e) {
+        console.error("Failed to fetch asset trends:", e);
+        setTrend({ dates: [], series: [] });
+      }
+    };
+
+    fetchTrend();
+  }, [trendDimension]);
+
   // Memoized filtered assets based on all filter states
   const filteredAssets = useMemo(() => {
     let tempAssets = allAssets;
@@ -192,6 +212,19 @@ function ReportsPage() {
   }, [allAssets]);
 
 
+  // Data for Line Chart (asset counts over time): one point per snapshot date, one line per value (top 6)
+  const trendSeries = useMemo(() => trend.series.slice(0, PIE_COLORS.length).map(series => ({
+    ...series,
+    name: series.name || 'Unspecified',
+  })), [trend]);
+  const trendChartData = useMemo(() => trend.dates.map((snapshotDate, index) => {
+    const point = { date: snapshotDate };
+    trendSeries.forEach(series => {
+      point[series.name] = series.counts[index];
+    });
+    return point;
+  }), [trend, trendSeries]);
+
   // Function to handle CSV download
   const handleDownloadReport = () => {
     if (filteredAssets.length === 0) {
@@ -390,6 +423,16 @@ function ReportsPage() {
           margin-bottom: 1rem; /* Equivalent to mb-4 */
         }
 
+        .trend-chart-card {
+          margin-bottom: 2.5rem;
+        }
+
+        .trend-dimension-select {
+          align-self: flex-end;
+          width: auto;
+          margin-bottom: 1rem;
+        }
+
         .no-chart-data {
           color: #4b5563; /* Equivalent to text-gray-600 */
           text-align: center;
@@ -686,6 +729,39 @@ function ReportsPage() {
           </div>
         </div>
 
+        <div className="chart-card trend-chart-card">
+          <h3 className="chart-title">Asset Trends</h3>
+          <select
+            value={trendDimension}
+            onChange={(e) => setTrendDimension(e.target.value)}
+            className="filter-select trend-dimension-select"
+          >
+            <option value="status">By Status</option>
+            <option value="category">By Category</option>
+            <option value="location">By Location</option>
+            <option value="department">By Department</option>
+            <option value="warranty">By Warranty</option>
+            <option value="assignment">By Assignment</option>
+            <option value="total">Total Assets</option>
+          </select>
+          {trendChartData.length > 0 ? (
+            <ResponsiveContainer width="100%" height={300}>
+              <LineChart data={trendChartData} margin={{ top: 5, right: 30, left: 20, bottom: 5 }}>
+                <CartesianGrid strokeDasharray="3 3" />
+                <XAxis dataKey="date" tickFormatter={formatDate} />
+                <YAxis />
+                <Tooltip labelFormatter={formatDate} />
+                <Legend />
+                {trendSeries.map((series, index) => (
+                  <Line key={series.name} type="monotone" dataKey={series.name} stroke={PIE_COLORS[index]} dot={false} />
+                ))}
+              </LineChart>
+            </ResponsiveContainer>
+          ) : (
+            <p className="no-chart-data">No snapshots yet. They are taken once a day by the background jobs.</p>
+          )}
+        </div>
+
         <div className="filter-card">
           <h3 className="filter-title">Filter Assets</h3>
           <div className="filter-grid">
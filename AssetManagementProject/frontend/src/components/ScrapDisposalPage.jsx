@@ -56,43 +56,13 @@ function ScrapDisposalPage() {
     }
 
     try {
-      // Fetch the current asset data to ensure we send all required fields for PUT
-      const assetResponse = await fetch(`${backendUrl}/api/assets/${assetId}`);
-      if (!assetResponse.ok) {
-          const errorData = await assetResponse.json();
-          throw new Error(`Failed to fetch asset for update: ${assetResponse.status} - ${errorData.error || assetResponse.statusText}`);
-      }
-      const assetToUpdate = await assetResponse.json();
-
-      // IMPORTANT: Construct the payload with ALL fields the backend expects for a PUT request.
-      const payload = {
-        asset_code: assetToUpdate.asset_code,
-        serial_number: assetToUpdate.serial_number,
-        capital_date: assetToUpdate.capital_date ? new Date(assetToUpdate.capital_date).toISOString().split('T')[0] : null,
-        year: assetToUpdate.year,
-        asset_type: assetToUpdate.asset_type,
-        asset_description: assetToUpdate.asset_description,
-        make: assetToUpdate.make,
-        model: assetToUpdate.model,
-        status: newStatus, // This is the updated status
-        department: assetToUpdate.department,
-        division: assetToUpdate.division,
-        plant_code: assetToUpdate.plant_code,
-        warranty_status: assetToUpdate.warranty_status,
-        expiry_date: assetToUpdate.expiry_date ? new Date(assetToUpdate.expiry_date).toISOString().split('T')[0] : null,
-        category_name: assetToUpdate.category_name,
-        location_name: assetToUpdate.location_name,
-        user_id: assetToUpdate.user_id,
-      };
-
-      console.log("Sending PUT payload:", payload); // Log payload to console for debugging
-
+      // PATCH sends only the changed field; the backend leaves everything else untouched
       const response = await fetch(`${backendUrl}/api/assets/${assetId}`, {
-        method: 'PUT',
+        method: 'PATCH',
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify(payload),
+        body: JSON.stringify({ status: newStatus }),
       });
 
       if (!response.ok) {
@@ -42,7 +42,9 @@ function WarrantyAlertsPage() {
     setLoading(true);
     setError(null);
     try {
-      const response = await fetch(`${backendUrl}/api/assets`);
+      // Only the columns this page renders (plus status for the disposal filter)
+      const fields = 'id,asset_code,serial_number,asset_type,user_name,warranty_status,expiry_date,status';
+      const response = await fetch(`${backendUrl}/api/assets?fields=${fields}`);
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
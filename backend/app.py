@@ -1,42 +1,127 @@
 # backend/app.py
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS # Import CORS
-from datetime import datetime, date # Import date for clearer type hints
+from datetime import datetime, date, timedelta # Import date for clearer type hints
+from sqlalchemy import and_, case, func, or_, select
+from werkzeug.datastructures import MultiDict
+import base64
+import click
+import json
 import logging # Import logging for better error reporting
+import os
+import subprocess
+import sys
+import tempfile
 
 # Import db and migrate from our new extensions.py file
 from extensions import db, migrate
+from db_config import configure_database, register_sqlite_tuning
+from json_provider import create_json_provider, dumps as json_dumps
+import asset_search
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 app = Flask(__name__)
 
-# Configure your database
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///asset_management.db'
+# Configure your database (DATABASE_URL and pool/SQLite tuning come from the environment, see db_config.py)
+configure_database(app)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['LOOKUP_CACHE_SIZE'] = 1024 # Max Category/Location names cached per process
+# Response cache for list endpoints: 'memory' (per process), 'sqlite' (shared by local workers) or 'none'
+app.config['RESPONSE_CACHE_BACKEND'] = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+app.config['RESPONSE_CACHE_TTL'] = int(os.environ.get('RESPONSE_CACHE_TTL', 30)) # Seconds
+app.config['RESPONSE_CACHE_MAX_ENTRIES'] = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 256))
+app.config['RESPONSE_CACHE_MAX_BYTES'] = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+app.config['RESPONSE_CACHE_PATH'] = os.environ.get(
+    'RESPONSE_CACHE_PATH', os.path.join(app.instance_path, 'response_cache.db'))
+# Per-route SQL statement budgets (see query_budget.py): 'off', 'log' (development) or 'raise' (tests)
+app.config['QUERY_BUDGET_MODE'] = os.environ.get('QUERY_BUDGET_MODE', 'off')
+app.config['QUERY_BUDGET_REPEAT_THRESHOLD'] = int(os.environ.get('QUERY_BUDGET_REPEAT_THRESHOLD', 5))
+# Response compression (see response_compression.py): encodings offered in preference order, size threshold and levels
+app.config['COMPRESSION_ALGORITHMS'] = os.environ.get('COMPRESSION_ALGORITHMS', 'br,gzip') # '' disables compression
+app.config['COMPRESSION_MIN_SIZE'] = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024)) # Bytes
+app.config['COMPRESSION_GZIP_LEVEL'] = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+app.config['COMPRESSION_BROTLI_LEVEL'] = int(os.environ.get('COMPRESSION_BROTLI_LEVEL', 4))
+app.config['COMPRESSION_STREAM_FLUSH_BYTES'] = int(os.environ.get('COMPRESSION_STREAM_FLUSH_BYTES', 64 * 1024))
+# Response JSON encoder: 'orjson' (default when installed) or 'stdlib', see json_provider.py
+app.config['JSON_PROVIDER'] = os.environ.get('JSON_PROVIDER')
+app.config['CHANGE_LOG_RETENTION_DAYS'] = int(os.environ.get('CHANGE_LOG_RETENTION_DAYS', 30)) # Used by flask prune-change-log
+# Background jobs (see background_jobs.py): 'on' runs them on a thread in the web process; `flask run-jobs` runs them standalone
+app.config['JOB_SCHEDULER'] = os.environ.get('JOB_SCHEDULER', 'off')
+app.config['WARRANTY_RECONCILE_INTERVAL'] = int(os.environ.get('WARRANTY_RECONCILE_INTERVAL', 3600)) # Seconds
+app.config['ASSET_SNAPSHOT_INTERVAL'] = int(os.environ.get('ASSET_SNAPSHOT_INTERVAL', 24 * 3600)) # Seconds; reruns replace the day's snapshot
 
 # Initialize extensions with the app instance
 db.init_app(app) 
-migrate.init_app(app, db) # Initialize Flask-Migrate with the app and db
-CORS(app) # Enable CORS for all origins
+migrate.init_app(app, db, include_object=asset_search.include_object) # Initialize Flask-Migrate with the app and db
+with app.app_context():
+    register_sqlite_tuning(db.engine) # WAL, synchronous=NORMAL, busy_timeout, mmap and cache size
+app.json = create_json_provider(app)
+CORS(app, expose_headers=['X-Next-Cursor', 'ETag']) # Enable CORS for all origins; expose pagination/cache headers
 
 # Import models AFTER db has been initialized with the app.
 # This prevents the circular import.
 from models import Asset, Category, Location, User 
+from asset_import import import_assets, iter_csv_rows, iter_json_rows
+from change_versions import etag_from_versions, on_tables_committed, seed_table_versions
+from change_log import (TRACKED_TABLES, current_sequence, prune_change_log, read_changes,
+                        record_row_changes)
+from lookup_cache import LookupCache
+from response_cache import ResponseCache, create_backend
+from query_plans import explain_query_plan, find_full_scans
+from asset_events import AssetEventBroker, record_previous_statuses, record_written_values
+from request_metrics import RequestMetrics
+from query_budget import QueryBudgetGuard, query_budget
+from response_compression import ResponseCompression
+from background_jobs import JobScheduler
+from warranty_reconcile import reconcile_warranty_status
+from asset_snapshots import SNAPSHOT_DIMENSIONS, read_asset_trend, take_asset_summary_snapshot
+
+# Process-local name -> id caches for the asset write path.
+# Invalidated by the category/location update and delete routes.
+category_id_cache = LookupCache(app.config['LOOKUP_CACHE_SIZE'])
+location_id_cache = LookupCache(app.config['LOOKUP_CACHE_SIZE'])
+
+# Cached list responses; entries for a table are dropped whenever a commit writes to it.
+response_cache = ResponseCache(create_backend(app.config), app.config['RESPONSE_CACHE_TTL'])
+on_tables_committed(response_cache.invalidate_tables)
+
+# Per-endpoint latency, status, SQL and response size metrics, served on /metrics.
+request_metrics = RequestMetrics()
+with app.app_context():
+    request_metrics.init_app(app, db.engine)
+
+# Flags routes that exceed their @query_budget or repeat one statement shape (N+1).
+query_budget_guard = QueryBudgetGuard()
+with app.app_context():
+    query_budget_guard.init_app(app, db.engine)
+
+# Brotli/gzip per Accept-Encoding, streamed responses included; registered last so it runs first.
+response_compression = ResponseCompression()
+response_compression.init_app(app)
+
+# Periodic maintenance jobs; each run is recorded in job_run and listed on /api/jobs.
+job_scheduler = JobScheduler()
+job_scheduler.init_app(app)
+job_scheduler.add_job('reconcile-warranty-status', lambda: sum(reconcile_warranty_status().values()),
+                      app.config['WARRANTY_RECONCILE_INTERVAL'])
+job_scheduler.add_job('snapshot-asset-summary', lambda: take_asset_summary_snapshot(expiring_soon_days=EXPIRING_SOON_DAYS),
+                      app.config['ASSET_SNAPSHOT_INTERVAL'])
 
 # Helper function to get or create a Category by name
 def get_or_create_category(name, description=None):
     """
     Retrieves an existing Category by name or creates a new one if it doesn't exist.
-    Commits the new category to the database if created.
+    A new category is flushed, not committed, so it commits (or rolls back) together
+    with the asset write that needed it.
     """
     category = Category.query.filter_by(name=name).first()
     if not category:
         category = Category(name=name, description=description or f"Auto-created category: {name}")
         db.session.add(category)
-        db.session.commit() # Commit new category to get its ID
+        db.session.flush() # Assigns the ID inside the request's transaction
         app.logger.info(f"Created new category: {name}")
     return category
 
@@ -44,16 +129,42 @@ def get_or_create_category(name, description=None):
 def get_or_create_location(name, address=None):
     """
     Retrieves an existing Location by name or creates a new one if it doesn't exist.
-    Commits the new location to the database if created.
+    A new location is flushed, not committed, so it commits (or rolls back) together
+    with the asset write that needed it.
     """
     location = Location.query.filter_by(name=name).first()
     if not location:
         location = Location(name=name, address=address or f"Auto-created location: {name}")
         db.session.add(location)
-        db.session.commit() # Commit new location to get its ID
+        db.session.flush() # Assigns the ID inside the request's transaction
         app.logger.info(f"Created new location: {name}")
     return location
 
+def _resolve_lookup_id(cache, get_or_create, name):
+    lookup_id = cache.get(name)
+    if lookup_id is None:
+        lookup_id = get_or_create(name).id
+        cache.put_after_commit(db.session, name, lookup_id) # The row may be new and uncommitted
+    return lookup_id
+
+# Helper function to resolve a Category name to its ID through the lookup cache
+def get_or_create_category_id(name):
+    """
+    Returns the ID of the Category with the given name, creating it if needed.
+    Served from category_id_cache when possible so repeat names cost no query;
+    names created by this request are cached once it commits.
+    """
+    return _resolve_lookup_id(category_id_cache, get_or_create_category, name)
+
+# Helper function to resolve a Location name to its ID through the lookup cache
+def get_or_create_location_id(name):
+    """
+    Returns the ID of the Location with the given name, creating it if needed.
+    Served from location_id_cache when possible so repeat names cost no query;
+    names created by this request are cached once it commits.
+    """
+    return _resolve_lookup_id(location_id_cache, get_or_create_location, name)
+
 
 # Test route
 @app.route('/api/test', methods=['GET'])
@@ -64,88 +175,361 @@ def test_api():
     app.logger.info("Test API endpoint hit.")
     return jsonify({'message': 'Welcome to Asset Management System'})
 
+# --- ASSET READ PATH ---
+# Every column an asset response carries, keyed by the name used in the JSON payload.
+# Category, Location and User names are pulled in through outer joins so that a
+# list of N assets costs one SELECT instead of 1 + 3N lazy relationship loads.
+ASSET_FIELDS = {
+    'id': Asset.id,
+    'asset_code': Asset.asset_code,
+    'serial_number': Asset.serial_number,
+    'capital_date': Asset.capital_date,
+    'year': Asset.year,
+    'asset_type': Asset.asset_type,
+    'asset_description': Asset.asset_description,
+    'make': Asset.make,
+    'model': Asset.model,
+    'status': Asset.status,
+    'department': Asset.department,
+    'division': Asset.division,
+    'plant_code': Asset.plant_code,
+    'warranty_status': Asset.warranty_status,
+    'expiry_date': Asset.expiry_date,
+    'category_id': Asset.category_id,
+    'category_name': Category.name,
+    'location_id': Asset.location_id,
+    'location_name': Location.name,
+    'user_id': Asset.user_id,
+    'user_name': User.name,
+}
+
+def join_asset_relations(query):
+    """
+    Outer-joins Category, Location and User onto a query whose FROM starts at Asset.
+    """
+    return (
+        query.select_from(Asset)
+        .outerjoin(Category, Asset.category_id == Category.id)
+        .outerjoin(Location, Asset.location_id == Location.id)
+        .outerjoin(User, Asset.user_id == User.id)
+    )
+
+ASSET_DATE_FIELDS = ('capital_date', 'expiry_date')
+# Low-cardinality strings repeated on most rows; ?format=columnar sends each distinct value once
+ASSET_DICTIONARY_FIELDS = ('status', 'category_name', 'location_name', 'warranty_status', 'department', 'division')
+
+def parse_asset_fields(fields_param):
+    """
+    Parses a ?fields=id,asset_code,... projection into a list of ASSET_FIELDS keys, in the
+    order given. Returns every field when the parameter is absent.
+    """
+    if not fields_param:
+        return list(ASSET_FIELDS)
+    fields = list(dict.fromkeys(name.strip() for name in fields_param.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in ASSET_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown fields: {', '.join(unknown) or fields_param}. "
+                         f"Valid fields: {', '.join(ASSET_FIELDS)}.")
+    return fields
+
+def asset_rows_query(fields=None):
+    """
+    Builds the shared asset query: one SELECT over Asset outer-joined to Category,
+    Location and User, projecting only the requested ASSET_FIELDS keys (all by default).
+    """
+    return join_asset_relations(
+        db.session.query(*[ASSET_FIELDS[key].label(key) for key in (fields or ASSET_FIELDS)])
+    )
+
+def asset_rows_select(fields=None):
+    """
+    Same as asset_rows_query() but as a Core select(), for callers without the Flask
+    session (the async routes in asgi.py).
+    """
+    return join_asset_relations(select(*[ASSET_FIELDS[key].label(key) for key in (fields or ASSET_FIELDS)]))
+
+def serialize_asset_row(row, fields=None):
+    """
+    Converts a row produced by asset_rows_query() into the asset response dict.
+    With fields, only those keys are emitted (the row may carry extra columns).
+    Dates stay date objects; the JSON provider writes them as ISO 8601.
+    """
+    data = dict(zip(row._fields, row)) # Much cheaper than going through row._mapping
+    return {key: data[key] for key in fields} if fields else data
+
+def encode_asset_columns(rows, fields):
+    """
+    Column-oriented payload for ?format=columnar: one array per field instead of one object
+    per row, with ASSET_DICTIONARY_FIELDS sent as indexes into a per-field list of distinct
+    values (null stays null). Row i is rebuilt client-side from columns[field][i].
+    """
+    values_by_field = list(zip(*rows)) if rows else [()] * len(fields)
+    columns, dictionaries = {}, {}
+    for key, values in zip(fields, values_by_field):
+        if key in ASSET_DICTIONARY_FIELDS:
+            dictionary = {}
+            values = [None if value is None else dictionary.setdefault(value, len(dictionary)) for value in values]
+            dictionaries[key] = list(dictionary)
+        columns[key] = list(values)
+    return {'format': 'columnar', 'count': len(rows), 'fields': fields,
+            'columns': columns, 'dictionaries': dictionaries}
+
+# --- ASSET FILTERING, SORTING AND PAGINATION ---
+# Fields matched by the free-text ?search= filter (same set the Reports page searched client-side)
+ASSET_SEARCH_FIELDS = (
+    'asset_code', 'serial_number', 'asset_type', 'asset_description',
+    'make', 'model', 'category_name', 'location_name', 'user_name',
+)
+EXPIRING_SOON_DAYS = 30 # Matches the isExpiringSoon() default used by the frontend
+MAX_ASSET_PAGE_SIZE = 1000
+DEFAULT_SEARCH_LIMIT = 50
+EXPORT_BATCH_SIZE = 1000 # Rows fetched per round trip while streaming an export
+WARRANTY_ALERT_BUCKETS = (7, 30, 90) # Day windows reported by /api/warranty/alerts
+MAX_BULK_ASSET_IDS = 5000 # Upper bound on ids accepted by a single bulk request
+
+def apply_asset_filters(query, args):
+    """
+    Narrows an asset query using the filters the asset pages offer: status (repeatable,
+    e.g. ?status=Pending Scrap Approval&status=Disposed), category_name, location_name,
+    user_id ('null' for unassigned), warranty_status, department, division, plant_code,
+    expiry_range ('expired', 'expiring_30_days', 'not_expiring_soon') and a free-text
+    search term. Raises ValueError for malformed filter values.
+    """
+    statuses = [status for status in args.getlist('status') if status]
+    if len(statuses) == 1:
+        query = query.filter(Asset.status == statuses[0])
+    elif statuses:
+        query = query.filter(Asset.status.in_(statuses))
+
+    for key in ('category_name', 'location_name', 'warranty_status', 'department', 'division', 'plant_code'):
+        if args.get(key):
+            query = query.filter(ASSET_FIELDS[key] == args[key])
+
+    user_id = args.get('user_id')
+    if user_id:
+        if user_id == 'null':
+            query = query.filter(Asset.user_id.is_(None))
+        else:
+            try:
+                query = query.filter(Asset.user_id == int(user_id))
+            except ValueError:
+                raise ValueError("user_id must be an integer or 'null'.")
+
+    expiry_range = args.get('expiry_range')
+    if expiry_range:
+        today = date.today()
+        soon = today + timedelta(days=EXPIRING_SOON_DAYS)
+        if expiry_range == 'expired':
+            query = query.filter(Asset.expiry_date < today)
+        elif expiry_range == 'expiring_30_days':
+            query = query.filter(Asset.expiry_date.between(today, soon))
+        elif expiry_range == 'not_expiring_soon':
+            query = query.filter(or_(Asset.expiry_date.is_(None), Asset.expiry_date > soon))
+        else:
+            raise ValueError(f"Unsupported expiry_range: {expiry_range}")
+
+    search = (args.get('search') or '').strip()
+    if search:
+        query = query.filter(or_(*[
+            ASSET_FIELDS[key].icontains(search, autoescape=True) for key in ASSET_SEARCH_FIELDS
+        ]))
+    return query
+
+def parse_asset_sort(sort_param):
+    """
+    Parses a ?sort= value such as 'expiry_date' or '-asset_code' into (field, descending).
+    """
+    sort_param = sort_param or 'id'
+    descending = sort_param.startswith('-')
+    key = sort_param[1:] if descending else sort_param
+    if key not in ASSET_FIELDS:
+        raise ValueError(f"Unsupported sort field: {key}")
+    return key, descending
+
+def encode_asset_cursor(sort_param, row):
+    """
+    Builds an opaque keyset cursor from the last row of a page: the sort value plus the asset id.
+    """
+    value = row._mapping[parse_asset_sort(sort_param)[0]]
+    if isinstance(value, date):
+        value = value.isoformat()
+    payload = json.dumps({'s': sort_param, 'v': value, 'id': row.id})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_asset_cursor(cursor, sort_param):
+    """
+    Reverses encode_asset_cursor(). The cursor must have been issued for the same sort order.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value, last_id = payload['v'], int(payload['id'])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor.")
+    if payload.get('s') != sort_param:
+        raise ValueError("Cursor was issued for a different sort order.")
+    column = ASSET_FIELDS[parse_asset_sort(sort_param)[0]]
+    try:
+        if isinstance(value, (dict, list)):
+            raise TypeError("Cursor sort value must be a scalar.")
+        if value is not None and isinstance(column.type, db.Date):
+            value = date.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor.")
+    return value, last_id
+
+def apply_asset_ordering(query, sort_param, cursor=None):
+    """
+    Orders an asset query by the requested field with Asset.id as the tie-breaker and, when a
+    cursor is given, seeks past the last row already returned (keyset pagination). NULLs sort
+    first ascending and last descending on every backend so the seek predicate stays valid.
+    """
+    key, descending = parse_asset_sort(sort_param)
+    column = ASSET_FIELDS[key]
+    if cursor:
+        value, last_id = decode_asset_cursor(cursor, sort_param)
+        after_id = Asset.id < last_id if descending else Asset.id > last_id
+        if key == 'id':
+            query = query.filter(after_id)
+        elif value is None:
+            # Still inside the NULL block: later NULL rows, then (ascending) every non-NULL row
+            seek = and_(column.is_(None), after_id)
+            query = query.filter(seek if descending else or_(seek, column.isnot(None)))
+        else:
+            beyond = column < value if descending else column > value
+            seek = or_(beyond, and_(column == value, after_id))
+            query = query.filter(or_(seek, column.is_(None)) if descending else seek)
+
+    if key == 'id':
+        return query.order_by(Asset.id.desc() if descending else Asset.id.asc())
+    if descending:
+        return query.order_by(column.desc().nulls_last(), Asset.id.desc())
+    return query.order_by(column.asc().nulls_first(), Asset.id.asc())
+
+def parse_page_size(limit_param):
+    """
+    Validates ?limit=. Returns None when no limit was requested (full list).
+    """
+    if limit_param is None:
+        return None
+    try:
+        limit = int(limit_param)
+    except ValueError:
+        raise ValueError("limit must be a positive integer.")
+    if limit < 1:
+        raise ValueError("limit must be a positive integer.")
+    return min(limit, MAX_ASSET_PAGE_SIZE)
+
 # --- ASSET ROUTES ---
 @app.route('/api/assets', methods=['GET'])
+@etag_from_versions('asset', 'category', 'location', 'user', daily=True, vary=('Accept',)) # JSON or NDJSON
+@response_cache.cached('asset', 'category', 'location', 'user', daily=True, vary=('Accept',))
+@query_budget(3)
 def get_assets():
     """
-    Retrieves all assets from the database, joining with related Category, 
+    Retrieves assets from the database, joining with related Category, 
     Location, and User data to include names in the response.
+    Supports the filters in apply_asset_filters(), ?sort=<field> (or -<field>)
+    and keyset pagination through ?limit= and ?cursor=. When more rows remain,
+    the cursor for the next page is returned in the X-Next-Cursor header.
+    ?fields=a,b,c limits both the SELECT and the response to those fields, and
+    ?format=columnar returns column arrays (see encode_asset_columns()) instead of row objects.
+    Clients sending Accept: application/x-ndjson receive a streamed export instead.
     """
     try:
-        assets = Asset.query.all()
-        result = []
-        for asset in assets:
-            user_name = asset.assigned_user.name if asset.assigned_user else None
-            result.append({
-                'id': asset.id,
-                'asset_code': asset.asset_code,
-                'serial_number': asset.serial_number,
-                'capital_date': asset.capital_date.isoformat() if asset.capital_date else None,
-                'year': asset.year,
-                'asset_type': asset.asset_type,
-                'asset_description': asset.asset_description,
-                'make': asset.make,
-                'model': asset.model,
-                'status': asset.status,
-                'department': asset.department,
-                'division': asset.division,
-                'plant_code': asset.plant_code,
-                'warranty_status': asset.warranty_status,
-                'expiry_date': asset.expiry_date.isoformat() if asset.expiry_date else None,
-                'category_id': asset.category_id,
-                'category_name': asset.category.name if asset.category else None, # Include category name
-                'location_id': asset.location_id,
-                'location_name': asset.location.name if asset.location else None, # Include location name
-                'user_id': asset.user_id,
-                'user_name': user_name # Include user name
-            })
-        app.logger.info(f"Successfully retrieved {len(assets)} assets.")
-        return jsonify(result)
+        args = request.args
+        sort_param = args.get('sort', 'id')
+        limit = parse_page_size(args.get('limit'))
+        fields = parse_asset_fields(args.get('fields'))
+        response_format = args.get('format', 'rows')
+        if response_format not in ('rows', 'columnar'):
+            raise ValueError("format must be 'rows' or 'columnar'.")
+        # The keyset cursor needs the sort value and id of the last row even when not requested
+        selected = fields + [key for key in ('id', parse_asset_sort(sort_param)[0]) if key not in fields]
+        query = apply_asset_filters(asset_rows_query(selected), args)
+        query = apply_asset_ordering(query, sort_param, args.get('cursor'))
+        if limit is None and response_format == 'rows' and request.accept_mimetypes.best_match(
+                ['application/json', 'application/x-ndjson']) == 'application/x-ndjson':
+            return stream_asset_rows(query, fields)
+        if limit is not None:
+            query = query.limit(limit + 1)
+        rows = query.all()
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_asset_cursor(sort_param, rows[-1])
+
+        if response_format == 'columnar':
+            result = encode_asset_columns(rows, fields)
+        else:
+            result = [serialize_asset_row(row, fields) for row in rows]
+        app.logger.info(f"Successfully retrieved {len(rows)} assets.")
+        response = jsonify(result)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
+    except ValueError as e:
+        app.logger.warning(f"Invalid asset list parameters: {e}")
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         app.logger.error(f"Error retrieving assets: {e}", exc_info=True)
         return jsonify({'error': f"Failed to retrieve assets: {str(e)}"}), 500
 
+def stream_asset_rows(query, fields=None):
+    """
+    Returns a streaming NDJSON response for an asset query. Rows are pulled from the
+    database EXPORT_BATCH_SIZE at a time and written out as they arrive, so memory
+    stays flat regardless of table size and the first row is sent immediately.
+    """
+    def generate():
+        count = 0
+        for row in query.yield_per(EXPORT_BATCH_SIZE):
+            count += 1
+            yield json_dumps(serialize_asset_row(row, fields)) + '\n'
+        app.logger.info(f"Successfully streamed {count} assets.")
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/assets/export', methods=['GET'])
+@query_budget(3)
+def export_assets():
+    """
+    Streams every asset matching the list filters as newline-delimited JSON (one asset per line).
+    Accepts the same filter, ?sort= and ?fields= parameters as GET /api/assets; pagination is not applied.
+    """
+    try:
+        fields = parse_asset_fields(request.args.get('fields'))
+        query = apply_asset_filters(asset_rows_query(fields), request.args)
+        query = apply_asset_ordering(query, request.args.get('sort', 'id'))
+        return stream_asset_rows(query, fields)
+    except ValueError as e:
+        app.logger.warning(f"Invalid asset export parameters: {e}")
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error exporting assets: {e}", exc_info=True)
+        return jsonify({'error': f"Failed to export assets: {str(e)}"}), 500
+
 # NEW: Route to get a single asset by ID
 @app.route('/api/assets/<int:id>', methods=['GET'])
+@query_budget(2)
 def get_asset(id):
     """
     Retrieves a single asset by its ID, including related Category, 
     Location, and User names. Returns 404 if not found.
     """
     try:
-        asset = Asset.query.get_or_404(id)
-        user_name = asset.assigned_user.name if asset.assigned_user else None
-        asset_data = {
-            'id': asset.id,
-            'asset_code': asset.asset_code,
-            'serial_number': asset.serial_number,
-            'capital_date': asset.capital_date.isoformat() if asset.capital_date else None,
-            'year': asset.year,
-            'asset_type': asset.asset_type,
-            'asset_description': asset.asset_description,
-            'make': asset.make,
-            'model': asset.model,
-            'status': asset.status,
-            'department': asset.department,
-            'division': asset.division,
-            'plant_code': asset.plant_code,
-            'warranty_status': asset.warranty_status,
-            'expiry_date': asset.expiry_date.isoformat() if asset.expiry_date else None,
-            'category_id': asset.category_id,
-            'category_name': asset.category.name if asset.category else None,
-            'location_id': asset.location_id,
-            'location_name': asset.location.name if asset.location else None,
-            'user_id': asset.user_id,
-            'user_name': user_name
-        }
+        row = asset_rows_query().filter(Asset.id == id).first()
+        if row is None:
+            app.logger.warning(f"Asset not found with ID: {id}")
+            return jsonify({'error': 'Asset not found'}), 404
         app.logger.info(f"Successfully retrieved asset with ID: {id}")
-        return jsonify(asset_data)
+        return jsonify(serialize_asset_row(row))
     except Exception as e:
         app.logger.error(f"Error retrieving asset {id}: {e}", exc_info=True)
         return jsonify({'error': f"Failed to retrieve asset: {str(e)}"}), 500
 
 
 @app.route('/api/assets', methods=['POST'])
+@query_budget(12)
 def add_asset():
     """
     Adds a new asset to the database. Automatically creates Category and Location
@@ -154,8 +538,8 @@ def add_asset():
     data = request.json
     try:
         # Get or create Category and Location based on name
-        category = get_or_create_category(data['category_name'])
-        location = get_or_create_location(data['location_name'])
+        category_id = get_or_create_category_id(data['category_name'])
+        location_id = get_or_create_location_id(data['location_name'])
 
         # Robust date parsing for capital_date and expiry_date
         capital_date = None
@@ -189,8 +573,8 @@ def add_asset():
             plant_code=data.get('plant_code'),
             warranty_status=data.get('warranty_status', 'In Warranty'),
             expiry_date=expiry_date,
-            category_id=category.id, # Use ID from the found/created category
-            location_id=location.id, # Use ID from the found/created location
+            category_id=category_id, # Use ID from the found/created category
+            location_id=location_id, # Use ID from the found/created location
             user_id=data.get('user_id')
         )
         db.session.add(new_asset)
@@ -208,6 +592,7 @@ def add_asset():
 
 
 @app.route('/api/assets/<int:id>', methods=['PUT']) # Explicitly ensure PUT is allowed
+@query_budget(14)
 def update_asset(id):
     """
     Updates an existing asset by its ID. Handles updating category and location
@@ -235,12 +620,9 @@ def update_asset(id):
             app.logger.warning(f"Location name missing for asset update (ID: {id})")
             return jsonify({'error': "Location name is required for asset update."}), 400
 
-        category = get_or_create_category(category_name)
-        location = get_or_create_location(location_name)
-        
         # Update category and location IDs on the asset
-        asset.category_id = category.id
-        asset.location_id = location.id
+        asset.category_id = get_or_create_category_id(category_name)
+        asset.location_id = get_or_create_location_id(location_name)
 
         # Update fields with data from request, or retain existing if not provided
         asset.asset_code = data.get('asset_code', asset.asset_code)
@@ -300,7 +682,59 @@ def update_asset(id):
         app.logger.error(f"An unexpected error occurred during asset update (ID: {id}): {str(e)}", exc_info=True)
         return jsonify({'error': f"An unexpected error occurred during asset update: {str(e)}"}), 500
 
+# Fields PATCH /api/assets/<id> accepts; category_name and location_name are resolved to ids
+ASSET_PATCH_FIELDS = (
+    'asset_code', 'serial_number', 'capital_date', 'year', 'asset_type', 'asset_description',
+    'make', 'model', 'status', 'department', 'division', 'plant_code', 'warranty_status',
+    'expiry_date', 'user_id', 'category_name', 'location_name',
+)
+ASSET_REQUIRED_FIELDS = ('asset_code', 'serial_number', 'category_name', 'location_name')
+
+@app.route('/api/assets/<int:id>', methods=['PATCH'])
+@query_budget(8)
+def patch_asset(id):
+    """
+    Partially updates an asset: only the fields present in the JSON body are changed, and
+    category/location names are only resolved when sent. Dates accept YYYY-MM-DD or null.
+    """
+    asset = Asset.query.get_or_404(id)
+    data = request.get_json(silent=True)
+    try:
+        if not isinstance(data, dict) or not data:
+            raise ValueError("Request body must be a non-empty JSON object.")
+        unknown = sorted(set(data) - set(ASSET_PATCH_FIELDS))
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}.")
+
+        for key, value in data.items():
+            if key in ASSET_REQUIRED_FIELDS and not value:
+                raise ValueError(f"{key} cannot be empty.")
+            if key == 'category_name':
+                asset.category_id = get_or_create_category_id(value)
+            elif key == 'location_name':
+                asset.location_id = get_or_create_location_id(value)
+            elif key in ASSET_DATE_FIELDS:
+                try:
+                    setattr(asset, key, datetime.fromisoformat(value).date() if value else None)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Invalid {key} format. Use YYYY-MM-DD.")
+            else:
+                setattr(asset, key, value)
+
+        db.session.commit()
+        app.logger.info(f"Successfully patched asset with ID: {id} ({', '.join(data)})")
+        return jsonify({'message': 'Asset updated successfully'}), 200
+    except ValueError as e:
+        db.session.rollback()
+        app.logger.warning(f"Invalid asset patch (ID: {id}): {e}")
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Failed to patch asset {id}: {e}", exc_info=True)
+        return jsonify({'error': f"Failed to update asset: {str(e)}"}), 500
+
 @app.route('/api/assets/<int:id>', methods=['DELETE'])
+@query_budget(4)
 def delete_asset(id):
     """
     Deletes an asset by its ID. Returns 404 if not found.
@@ -316,8 +750,487 @@ def delete_asset(id):
         app.logger.error(f"Error deleting asset {id}: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 400
 
+@app.route('/api/assets/search', methods=['GET'])
+@etag_from_versions('asset', 'category', 'location', 'user', daily=True)
+@query_budget(3)
+def search_assets():
+    """
+    Full-text asset search over asset_code, serial_number, asset_description, make, model
+    and the assigned user's name. Every word in ?q= is prefix-matched and results are
+    ranked by relevance (SQLite FTS5 bm25). Accepts the GET /api/assets filters and
+    ?limit= (default 50). Databases without the FTS index fall back to substring search.
+    """
+    search_text = (request.args.get('q') or '').strip()
+    if not search_text:
+        return jsonify({'error': 'q is required.'}), 400
+    try:
+        limit = parse_page_size(request.args.get('limit')) or DEFAULT_SEARCH_LIMIT
+        args = request.args.copy()
+        args.pop('search', None)
+        query = apply_asset_filters(asset_rows_query(), args)
+
+        if asset_search.search_index_available():
+            expression = asset_search.build_match_expression(search_text)
+            if expression is None:
+                return jsonify([])
+            query = (
+                query.join(asset_search.asset_fts, asset_search.asset_fts.c.rowid == Asset.id)
+                .filter(asset_search.match_clause(expression))
+                .order_by(asset_search.rank_expression(), Asset.id)
+            )
+        else:
+            query = apply_asset_filters(query, MultiDict({'search': search_text})).order_by(Asset.id)
+
+        result = [serialize_asset_row(row) for row in query.limit(limit)]
+        app.logger.info(f"Asset search for '{search_text}' returned {len(result)} assets.")
+        return jsonify(result)
+    except ValueError as e:
+        app.logger.warning(f"Invalid asset search parameters: {e}")
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error searching assets: {e}", exc_info=True)
+        return jsonify({'error': f"Failed to search assets: {str(e)}"}), 500
+
+@app.route('/api/assets/bulk_status', methods=['POST'])
+@query_budget(4)
+def bulk_update_asset_status():
+    """
+    Moves many assets to one status (e.g. Scrapped or Disposed) in a single transaction.
+    Expects {"ids": [...], "status": "..."}. Existing ids are changed with one set-based
+    UPDATE; the response reports an outcome per id: 'updated', 'unchanged' or 'not_found'.
+    """
+    data = request.json or {}
+    status = data.get('status')
+    ids = data.get('ids')
+    if not isinstance(status, str) or not status.strip():
+        return jsonify({'error': 'status is required.'}), 400
+    if not isinstance(ids, list) or not ids:
+        return jsonify({'error': 'ids must be a non-empty list of asset IDs.'}), 400
+    if len(ids) > MAX_BULK_ASSET_IDS:
+        return jsonify({'error': f"At most {MAX_BULK_ASSET_IDS} ids can be updated per request."}), 400
+    if not all(isinstance(asset_id, int) and not isinstance(asset_id, bool) for asset_id in ids):
+        return jsonify({'error': 'ids must be a non-empty list of asset IDs.'}), 400
+
+    try:
+        ids = list(dict.fromkeys(ids)) # De-duplicate while keeping request order
+        current = dict(db.session.query(Asset.id, Asset.status).filter(Asset.id.in_(ids)))
+        to_update = [asset_id for asset_id in ids if asset_id in current and current[asset_id] != status]
+        if to_update:
+            Asset.query.filter(Asset.id.in_(to_update)).execution_options(change_log=False).update(
+                {Asset.status: status}, synchronize_session=False)
+            record_row_changes(db.session, Asset.__tablename__, 'upsert', to_update)
+            record_previous_statuses(db.session, {asset_id: current[asset_id] for asset_id in to_update})
+            record_written_values(db.session, {asset_id: {'status': status} for asset_id in to_update})
+        db.session.commit()
+
+        changed = set(to_update)
+        results = []
+        for asset_id in ids:
+            if asset_id not in current:
+                outcome = 'not_found'
+            elif asset_id in changed:
+                outcome = 'updated'
+            else:
+                outcome = 'unchanged'
+            results.append({'id': asset_id, 'outcome': outcome})
+        app.logger.info(f"Bulk status change to '{status}': {len(to_update)} of {len(ids)} assets updated.")
+        return jsonify({
+            'message': 'Bulk status update completed',
+            'status': status,
+            'updated': len(to_update),
+            'results': results,
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Failed bulk status update to '{status}': {e}", exc_info=True)
+        return jsonify({'error': f"Failed to update asset statuses: {str(e)}"}), 400
+
+@app.route('/api/assets/import', methods=['POST'])
+@query_budget(8, per_batch=10) # Lookups and version bumps, plus duplicate checks, inserts and change log pages per batch
+def import_assets_bulk():
+    """
+    Bulk-imports assets from a CSV upload (multipart field 'file' or a text/csv body)
+    or a JSON array of asset objects, using the same field names as POST /api/assets.
+    Valid rows are inserted in batches within one transaction; invalid rows are skipped
+    and reported with their row number instead of aborting the load.
+    """
+    try:
+        upload = request.files.get('file')
+        if upload is not None:
+            if upload.filename.lower().endswith('.json'):
+                rows = iter_json_rows(json.load(upload.stream))
+            else:
+                rows = iter_csv_rows(upload.stream)
+        elif request.mimetype == 'text/csv':
+            rows = iter_csv_rows(request.stream)
+        else:
+            items = request.get_json(silent=True)
+            if not isinstance(items, list):
+                return jsonify({'error': 'Send a CSV file or a JSON array of assets.'}), 400
+            rows = iter_json_rows(items)
+
+        summary = import_assets(rows)
+        db.session.commit()
+        app.logger.info(f"Asset import finished: {summary['inserted']} inserted, {summary['failed']} failed.")
+        return jsonify({'message': 'Asset import completed', **summary}), 200
+    except (ValueError, UnicodeDecodeError) as e:
+        db.session.rollback()
+        app.logger.warning(f"Unreadable asset import payload: {e}")
+        return jsonify({'error': f"Could not read import file: {str(e)}"}), 400
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Failed to import assets: {e}", exc_info=True)
+        return jsonify({'error': f"Failed to import assets: {str(e)}"}), 500
+
+# --- CHANGE FEED ---
+def parse_change_tables(tables_param):
+    """
+    Validates ?tables=asset,user,... (default: every table in the change log).
+    """
+    if not tables_param:
+        return sorted(TRACKED_TABLES)
+    tables = sorted({name.strip() for name in tables_param.split(',') if name.strip()})
+    unknown = [name for name in tables if name not in TRACKED_TABLES]
+    if unknown or not tables:
+        raise ValueError(f"tables must be a comma-separated subset of: {', '.join(sorted(TRACKED_TABLES))}.")
+    return tables
+
+def load_changed_rows(table, ids, asset_fields):
+    """
+    Returns {id: serialized row} with the current state of the given rows; ids that no
+    longer exist are simply absent.
+    """
+    if table == 'asset':
+        selected = asset_fields if 'id' in asset_fields else asset_fields + ['id']
+        rows = asset_rows_query(selected).filter(Asset.id.in_(ids))
+        return {row.id: serialize_asset_row(row, asset_fields) for row in rows}
+    if table == 'user':
+        return {user.id: serialize_user(user) for user in User.query.filter(User.id.in_(ids))}
+    if table == 'category':
+        return {c.id: {'id': c.id, 'name': c.name, 'description': c.description}
+                for c in Category.query.filter(Category.id.in_(ids))}
+    return {l.id: {'id': l.id, 'name': l.name, 'address': l.address}
+            for l in Location.query.filter(Location.id.in_(ids))}
+
+@app.route('/api/assets/changes', methods=['GET'])
+@query_budget(7)
+def get_asset_changes():
+    """
+    Delta-sync feed over assets, users, categories and locations. Returns the rows
+    changed after ?since=<cursor> as 'upserts' (current state, per table) and 'deletes'
+    (ids, per table), plus the 'cursor' to send next time. Several changes to one row
+    collapse into its latest state. 'reset' lists tables the client must refetch in full:
+    all of them on the first call (no ?since=) or when the cursor has expired, and any
+    table rewritten by a bulk statement. has_more=true means another page is waiting.
+    Accepts ?tables=, ?limit= (log entries per page, default and max 1000) and the asset ?fields=.
+    """
+    try:
+        tables = parse_change_tables(request.args.get('tables'))
+        limit = parse_page_size(request.args.get('limit')) or MAX_ASSET_PAGE_SIZE
+        asset_fields = parse_asset_fields(request.args.get('fields'))
+        since_param = request.args.get('since')
+        if since_param is None:
+            return jsonify({'cursor': current_sequence(), 'has_more': False, 'reset': tables,
+                            'upserts': {}, 'deletes': {}})
+        try:
+            since = int(since_param)
+        except ValueError:
+            raise ValueError("since must be a cursor returned by this endpoint.")
+
+        entries, has_more, expired = read_changes(since, limit, tables)
+        if expired:
+            app.logger.info(f"Change feed cursor {since} expired; client must resync.")
+            return jsonify({'cursor': current_sequence(), 'has_more': False, 'reset': tables,
+                            'upserts': {}, 'deletes': {}})
+
+        reset, latest = set(), {}
+        for entry in entries:
+            if entry.operation == 'reset':
+                reset.add(entry.table_name)
+            else:
+                latest[(entry.table_name, entry.row_id)] = entry.operation
+
+        upserts, deletes = {}, {}
+        for table in tables:
+            upsert_ids = [row_id for (name, row_id), op in latest.items() if name == table and op == 'upsert']
+            deleted_ids = [row_id for (name, row_id), op in latest.items() if name == table and op == 'delete']
+            if upsert_ids:
+                rows = load_changed_rows(table, upsert_ids, asset_fields)
+                deleted_ids += [row_id for row_id in upsert_ids if row_id not in rows] # Deleted since
+                upserts[table] = list(rows.values())
+            if deleted_ids:
+                deletes[table] = sorted(deleted_ids)
+
+        cursor = entries[-1].id if entries else since
+        app.logger.info(f"Change feed from {since} to {cursor}: {len(entries)} log entries.")
+        return jsonify({'cursor': cursor, 'has_more': has_more, 'reset': sorted(reset),
+                        'upserts': upserts, 'deletes': deletes})
+    except ValueError as e:
+        app.logger.warning(f"Invalid change feed parameters: {e}")
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error reading change feed: {e}", exc_info=True)
+        return jsonify({'error': f"Failed to read changes: {str(e)}"}), 500
+
+# --- LIVE EVENTS ---
+# Fans committed asset changes out to SSE clients; rows are loaded once per commit, not per client.
+asset_event_broker = AssetEventBroker()
+asset_event_broker.init_app(app, lambda ids: load_changed_rows('asset', ids, list(ASSET_FIELDS)))
+ASSET_EVENT_FILTERS = ('category_name', 'location_name', 'status')
+
+@app.route('/api/assets/events', methods=['GET'])
+def stream_asset_events():
+    """
+    Server-Sent Events stream of asset.created, asset.updated, asset.status_changed and
+    asset.deleted events as writes commit, plus 'resync' when assets changed in bulk.
+    Optional ?category_name=, ?location_name= and ?status= filters (repeatable) are applied
+    server-side; a status filter also matches assets leaving that status. Each event id is
+    a change feed cursor, so after a reconnect a client can catch up through
+    GET /api/assets/changes?since=<last event id>.
+    """
+    filters = {field: set(request.args.getlist(field)) for field in ASSET_EVENT_FILTERS if request.args.getlist(field)}
+    subscriber = asset_event_broker.subscribe(filters)
+    app.logger.info(f"Asset event stream opened with filters {filters or 'none'}.")
+    response = Response(asset_event_broker.stream(subscriber), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no' # Tell nginx not to buffer the stream
+    return response
+
+# --- REPORT ROUTES ---
+# Breakdown key in the summary -> column the assets are grouped by
+ASSET_SUMMARY_BREAKDOWNS = {'by_status': Asset.status, 'by_category': Category.name, 'by_location': Location.name}
+
+def grouped_asset_counts_select(args, column):
+    """
+    Counts assets matching the list filters, grouped by a single column.
+    """
+    stmt = join_asset_relations(select(column, func.count(Asset.id)))
+    return apply_asset_filters(stmt, args).group_by(column).order_by(func.count(Asset.id).desc(), column)
+
+def asset_summary_selects(args):
+    """
+    Builds the aggregate statements behind the Reports summary: one for the headline
+    totals and one GROUP BY per breakdown, all honouring the GET /api/assets filters.
+    Returns (totals_select, {breakdown_key: select}).
+    """
+    today = date.today()
+    soon = today + timedelta(days=EXPIRING_SOON_DAYS)
+    totals = join_asset_relations(select(
+        func.count(Asset.id),
+        func.count(Asset.user_id),
+        func.sum(case((Asset.expiry_date < today, 1), else_=0)),
+        func.sum(case((Asset.expiry_date.between(today, soon), 1), else_=0)),
+    ))
+    breakdowns = {key: grouped_asset_counts_select(args, column) for key, column in ASSET_SUMMARY_BREAKDOWNS.items()}
+    return apply_asset_filters(totals, args), breakdowns
+
+def build_asset_summary(totals_row, breakdown_rows):
+    """
+    Shapes the results of asset_summary_selects() into the summary response.
+    """
+    total, assigned, expired, expiring_soon = totals_row
+    summary = {
+        'total_assets': total,
+        'assigned_assets': assigned,
+        'not_assigned_assets': total - assigned,
+        'expired_assets': expired or 0,
+        'expiring_soon_assets': expiring_soon or 0,
+        'expiring_soon_days': EXPIRING_SOON_DAYS,
+    }
+    for key, rows in breakdown_rows.items():
+        summary[key] = [{'name': name, 'count': count} for name, count in rows]
+    return summary
+
+def compute_asset_summary(args):
+    """
+    Computes the Reports page dashboard numbers with aggregate SQL: headline totals
+    plus per-status, per-category and per-location breakdowns, all honouring the
+    same filters as GET /api/assets.
+    """
+    totals, breakdowns = asset_summary_selects(args)
+    return build_asset_summary(
+        db.session.execute(totals).one(),
+        {key: db.session.execute(stmt).all() for key, stmt in breakdowns.items()},
+    )
+
+@app.route('/api/reports/summary', methods=['GET'])
+@etag_from_versions('asset', 'category', 'location', 'user', daily=True)
+@response_cache.cached('asset', 'category', 'location', 'user', daily=True)
+@query_budget(6)
+def get_report_summary():
+    """
+    Returns asset summary counts for the Reports dashboard, computed in the database.
+    Accepts the same filter parameters as GET /api/assets.
+    """
+    try:
+        summary = compute_asset_summary(request.args)
+        app.logger.info(f"Successfully computed report summary over {summary['total_assets']} assets.")
+        return jsonify(summary)
+    except ValueError as e:
+        app.logger.warning(f"Invalid report summary parameters: {e}")
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error computing report summary: {e}", exc_info=True)
+        return jsonify({'error': f"Failed to compute report summary: {str(e)}"}), 500
+
+DEFAULT_TREND_DAYS = 365 # History served by /api/reports/trends when ?from= is not given
+
+@app.route('/api/reports/trends', methods=['GET'])
+@etag_from_versions('asset_summary_snapshot', daily=True)
+@response_cache.cached('asset_summary_snapshot', daily=True)
+@query_budget(2)
+def get_report_trends():
+    """
+    Returns daily asset counts over time from the stored summary snapshots, for one
+    ?dimension= (status (default), category, location, department, warranty, assignment
+    or total) between ?from= and ?to= (ISO dates, default: the last 365 days).
+    """
+    dimension = request.args.get('dimension', 'status')
+    if dimension not in SNAPSHOT_DIMENSIONS:
+        return jsonify({'error': f"dimension must be one of {', '.join(SNAPSHOT_DIMENSIONS)}."}), 400
+    try:
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else date.today()
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') \
+            else end - timedelta(days=DEFAULT_TREND_DAYS)
+        if start > end:
+            raise ValueError("from must not be after to.")
+    except ValueError as e:
+        app.logger.warning(f"Invalid report trend range: {e}")
+        return jsonify({'error': f"Invalid date range: {e}"}), 400
+
+    try:
+        trend = read_asset_trend(dimension, start, end)
+        app.logger.info(f"Successfully retrieved {len(trend['dates'])} {dimension} snapshots.")
+        return jsonify({'dimension': dimension, 'from': start, 'to': end, **trend})
+    except Exception as e:
+        app.logger.error(f"Error retrieving report trends: {e}", exc_info=True)
+        return jsonify({'error': f"Failed to retrieve report trends: {str(e)}"}), 500
+
+# --- WARRANTY ROUTES ---
+def parse_bool_arg(value, default):
+    """
+    Interprets a query-string flag such as 'true', '1', 'false' or '0'.
+    """
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes')
+
+@app.route('/api/warranty/alerts', methods=['GET'])
+@etag_from_versions('asset', 'category', 'location', 'user', daily=True)
+@response_cache.cached('asset', 'category', 'location', 'user', daily=True)
+@query_budget(4)
+def get_warranty_alerts():
+    """
+    Returns assets whose warranty expires within ?days= (default 30) and, unless
+    ?include_expired=false, those that have already expired, ordered by expiry date.
+    Disposed assets are left out unless ?include_disposed=true. Both the rows and the
+    bucketed counts are range scans over the indexed expiry_date column. Also accepts
+    the GET /api/assets filters, ?fields= and an optional ?limit=.
+    """
+    try:
+        days = int(request.args.get('days', EXPIRING_SOON_DAYS))
+        if days < 0:
+            raise ValueError("days must be a non-negative integer.")
+    except ValueError:
+        app.logger.warning(f"Invalid warranty alert window: {request.args.get('days')}")
+        return jsonify({'error': 'days must be a non-negative integer.'}), 400
+
+    try:
+        include_expired = parse_bool_arg(request.args.get('include_expired'), True)
+        include_disposed = parse_bool_arg(request.args.get('include_disposed'), False)
+        limit = parse_page_size(request.args.get('limit'))
+        fields = parse_asset_fields(request.args.get('fields'))
+        today = date.today()
+
+        def scoped(query):
+            query = apply_asset_filters(query, request.args)
+            if not include_disposed:
+                query = query.filter(or_(Asset.status.is_(None), Asset.status != 'Disposed'))
+            return query
+
+        window_end = today + timedelta(days=days)
+        rows_query = scoped(asset_rows_query(fields)).filter(Asset.expiry_date <= window_end)
+        if not include_expired:
+            rows_query = rows_query.filter(Asset.expiry_date >= today)
+        rows_query = rows_query.order_by(Asset.expiry_date, Asset.id)
+        if limit is not None:
+            rows_query = rows_query.limit(limit)
+        assets = [serialize_asset_row(row) for row in rows_query]
+
+        bucket_columns = [func.sum(case((Asset.expiry_date < today, 1), else_=0))]
+        for bucket in WARRANTY_ALERT_BUCKETS:
+            bucket_columns.append(func.sum(case(
+                (Asset.expiry_date.between(today, today + timedelta(days=bucket)), 1), else_=0)))
+        bucket_query = scoped(join_asset_relations(db.session.query(*bucket_columns)))
+        counts = bucket_query.filter(
+            Asset.expiry_date <= today + timedelta(days=max(WARRANTY_ALERT_BUCKETS))).one()
+        buckets = {'expired': counts[0] or 0}
+        for bucket, count in zip(WARRANTY_ALERT_BUCKETS, counts[1:]):
+            buckets[f'within_{bucket}_days'] = count or 0
+
+        app.logger.info(f"Successfully retrieved {len(assets)} warranty alerts within {days} days.")
+        return jsonify({'days': days, 'buckets': buckets, 'assets': assets})
+    except ValueError as e:
+        app.logger.warning(f"Invalid warranty alert parameters: {e}")
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error retrieving warranty alerts: {e}", exc_info=True)
+        return jsonify({'error': f"Failed to retrieve warranty alerts: {str(e)}"}), 500
+
+# --- JOB ROUTES ---
+def serialize_job_run(run):
+    if run is None:
+        return None
+    return {
+        'started_at': run.started_at,
+        'duration_ms': run.duration_ms,
+        'succeeded': run.succeeded,
+        'rows_affected': run.rows_affected,
+        'error': run.error,
+    }
+
+@app.route('/api/jobs', methods=['GET'])
+@query_budget(2)
+def get_jobs():
+    """
+    Lists the background jobs with their interval and most recent run.
+    """
+    try:
+        last_runs = job_scheduler.last_runs()
+        return jsonify([{
+            'name': name,
+            'interval_seconds': job.interval,
+            'last_run': serialize_job_run(last_runs[name]),
+        } for name, job in job_scheduler.jobs.items()])
+    except Exception as e:
+        app.logger.error(f"Error retrieving background jobs: {e}", exc_info=True)
+        return jsonify({'error': f"Failed to retrieve background jobs: {str(e)}"}), 500
+
+# --- CACHE ROUTES ---
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """
+    Reports size and hit/miss counters for the lookup caches and the response cache.
+    """
+    return jsonify({
+        'category_lookup': category_id_cache.stats(),
+        'location_lookup': location_id_cache.stats(),
+        'responses': response_cache.stats(),
+    })
+
+# --- METRICS ---
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Prometheus scrape endpoint for this process's request metrics.
+    """
+    return request_metrics.response()
+
 # --- CATEGORY ROUTES (Kept for direct category management, though not essential for AssetForm now) ---
 @app.route('/api/categories', methods=['GET'])
+@etag_from_versions('category')
+@response_cache.cached('category')
+@query_budget(2)
 def get_categories():
     """
     Retrieves all categories from the database.
@@ -333,6 +1246,7 @@ def get_categories():
 
 
 @app.route('/api/categories', methods=['POST'])
+@query_budget(4)
 def add_category():
     """
     Adds a new category to the database.
@@ -350,16 +1264,19 @@ def add_category():
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/categories/<int:id>', methods=['PUT'])
+@query_budget(5)
 def update_category(id):
     """
     Updates an existing category by its ID. Returns 404 if not found.
     """
     category = Category.query.get_or_404(id)
     data = request.json
+    old_name = category.name
     try:
         category.name = data['name']
         category.description = data.get('description')
         db.session.commit()
+        category_id_cache.invalidate(old_name, category.name)
         app.logger.info(f"Successfully updated category with ID: {id}")
         return jsonify({'message': 'Category updated successfully'}), 200
     except Exception as e:
@@ -368,14 +1285,17 @@ def update_category(id):
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/categories/<int:id>', methods=['DELETE'])
+@query_budget(5)
 def delete_category(id):
     """
     Deletes a category by its ID. Returns 404 if not found.
     """
     category = Category.query.get_or_404(id)
     try:
+        name = category.name
         db.session.delete(category)
         db.session.commit()
+        category_id_cache.invalidate(name)
         app.logger.info(f"Successfully deleted category with ID: {id}")
         return jsonify({'message': 'Category deleted successfully'}), 200
     except Exception as e:
@@ -385,31 +1305,35 @@ def delete_category(id):
 
 
 # --- USER ROUTES ---
+def serialize_user(user):
+    return {
+        'id': user.id,
+        'emp_id': user.emp_id,
+        'emp_code': user.emp_code, 
+        'name': user.name,
+        'email': user.email,
+        'role': user.role,
+        'department': user.department, 
+        'division': user.division, 
+        'join_date': user.join_date, 
+        'status': user.status, 
+        'location': user.location, 
+        'phone_number': user.phone_number, 
+        'designation': user.designation, 
+        'reporting_manager': user.reporting_manager 
+    }
+
 @app.route('/api/users', methods=['GET'])
+@etag_from_versions('user')
+@response_cache.cached('user')
+@query_budget(2)
 def get_users():
     """
     Retrieves all users from the database.
     """
     try:
         users = User.query.all()
-        result = []
-        for user in users:
-            result.append({
-                'id': user.id,
-                'emp_id': user.emp_id,
-                'emp_code': user.emp_code, 
-                'name': user.name,
-                'email': user.email,
-                'role': user.role,
-                'department': user.department, 
-                'division': user.division, 
-                'join_date': user.join_date.isoformat() if user.join_date else None, 
-                'status': user.status, 
-                'location': user.location, 
-                'phone_number': user.phone_number, 
-                'designation': user.designation, 
-                'reporting_manager': user.reporting_manager 
-            })
+        result = [serialize_user(user) for user in users]
         app.logger.info(f"Successfully retrieved {len(users)} users.")
         return jsonify(result)
     except Exception as e:
@@ -417,6 +1341,7 @@ def get_users():
         return jsonify({'error': f"Failed to retrieve users: {str(e)}"}), 500
 
 @app.route('/api/users', methods=['POST'])
+@query_budget(4)
 def add_user():
     """
     Adds a new user to the database. Handles date parsing and validation.
@@ -461,6 +1386,7 @@ def add_user():
         return jsonify({'error': f"Failed to add user: {str(e)}"}), 400
 
 @app.route('/api/users/<int:id>', methods=['PUT'])
+@query_budget(4)
 def update_user(id):
     """
     Updates an existing user by their ID. Handles date parsing and partial updates.
@@ -515,6 +1441,9 @@ def update_user(id):
 
 # --- LOCATION ROUTES (Keeping for completeness, though not needed for UI now) ---
 @app.route('/api/locations', methods=['GET'])
+@etag_from_versions('location')
+@response_cache.cached('location')
+@query_budget(2)
 def get_locations():
     """
     Retrieves all locations from the database.
@@ -529,6 +1458,7 @@ def get_locations():
         return jsonify({'error': f"Failed to retrieve locations: {str(e)}"}), 500
 
 @app.route('/api/locations', methods=['POST'])
+@query_budget(4)
 def add_location():
     """
     Adds a new location to the database.
@@ -546,16 +1476,19 @@ def add_location():
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/locations/<int:id>', methods=['PUT'])
+@query_budget(5)
 def update_location(id):
     """
     Updates an existing location by its ID. Returns 404 if not found.
     """
     location = Location.query.get_or_404(id)
     data = request.json
+    old_name = location.name
     try:
         location.name = data['name']
         location.address = data.get('address')
         db.session.commit()
+        location_id_cache.invalidate(old_name, location.name)
         app.logger.info(f"Successfully updated location with ID: {id}")
         return jsonify({'message': 'Location updated successfully'}), 200
     except Exception as e:
@@ -564,14 +1497,17 @@ def update_location(id):
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/locations/<int:id>', methods=['DELETE'])
+@query_budget(5)
 def delete_location(id):
     """
     Deletes a location by its ID. Returns 404 if not found.
     """
     location = Location.query.get_or_404(id)
     try:
+        name = location.name
         db.session.delete(location)
         db.session.commit()
+        location_id_cache.invalidate(name)
         app.logger.info(f"Successfully deleted location with ID: {id}")
         return jsonify({'message': 'Location deleted successfully'}), 200
     except Exception as e:
@@ -579,10 +1515,216 @@ def delete_location(id):
         app.logger.error(f"Error deleting location {id}: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 400
 
+# --- MAINTENANCE COMMANDS ---
+@app.cli.command('prune-change-log')
+@click.option('--days', type=int, default=None, help='Keep this many days (default: CHANGE_LOG_RETENTION_DAYS).')
+def prune_change_log_command(days):
+    """
+    Deletes change feed entries older than the retention window. Clients whose cursor
+    predates the oldest remaining entry are told to resync.
+    """
+    days = app.config['CHANGE_LOG_RETENTION_DAYS'] if days is None else days
+    removed = prune_change_log(days)
+    click.echo(f"Removed {removed} change log entries older than {days} days.")
+
+@app.cli.command('run-jobs')
+@click.option('--once', is_flag=True, help='Run every job once and exit (for cron).')
+@click.option('--job', 'names', multiple=True, help='Only run this job (repeatable).')
+def run_jobs_command(once, names):
+    """
+    Runs the background jobs in the foreground, each on its interval, until interrupted.
+    """
+    unknown = [name for name in names if name not in job_scheduler.jobs]
+    if unknown:
+        raise click.BadParameter(f"Unknown jobs {unknown}; available: {list(job_scheduler.jobs)}", param_hint='--job')
+    if names:
+        job_scheduler.jobs = {name: job_scheduler.jobs[name] for name in names}
+    if once:
+        failed = 0
+        for name in job_scheduler.jobs:
+            run = job_scheduler.run_job(name)
+            click.echo(f"{name}: {'ok' if run.succeeded else 'FAILED'} in {run.duration_ms:.1f} ms, "
+                       f"{run.rows_affected} rows changed.{' ' + run.error if run.error else ''}")
+            failed += not run.succeeded
+        if failed:
+            raise click.ClickException(f"{failed} jobs failed.")
+        return
+    click.echo(f"Running {', '.join(job_scheduler.jobs)}; Ctrl+C to stop.")
+    try:
+        job_scheduler.run_forever()
+    except KeyboardInterrupt:
+        job_scheduler.stop()
+
+# Tables large enough that an unindexed scan on a hot query is a regression
+PLAN_CHECKED_TABLES = ('asset', 'user')
+
+def hot_asset_queries():
+    """
+    The filtered asset queries the UI issues most often, keyed by a short description.
+    Each one is expected to be served by an index rather than a full scan of asset.
+    """
+    def filtered(**params):
+        return apply_asset_filters(asset_rows_query(), MultiDict(params))
+
+    today = date.today()
+    return {
+        'status + category': filtered(status='Active', category_name='Laptop'),
+        'status IN (scrap/disposal)': filtered(status=['Pending Scrap Approval', 'Disposed']),
+        'category': filtered(category_name='Laptop'),
+        'location': filtered(location_name='Main Office'),
+        'assigned user': filtered(user_id='1'),
+        'unassigned': filtered(user_id='null'),
+        'warranty status': filtered(warranty_status='Out of Warranty'),
+        'department': filtered(department='IT'),
+        'division': filtered(division='Platform'),
+        'plant code': filtered(plant_code='PUNE01'),
+        'expired warranties': filtered(expiry_range='expired'),
+        'expiring within 30 days': filtered(expiry_range='expiring_30_days'),
+        'warranty alert window': asset_rows_query().filter(
+            Asset.expiry_date <= today + timedelta(days=EXPIRING_SOON_DAYS)).order_by(Asset.expiry_date),
+        'single asset': asset_rows_query().filter(Asset.id == 1),
+    }
+
+@app.cli.command('check-query-plans')
+def check_query_plans_command():
+    """
+    Runs EXPLAIN QUERY PLAN over the hot asset queries and fails if any of them
+    falls back to a full table scan of a large table (SQLite only).
+    """
+    if db.engine.dialect.name != 'sqlite':
+        click.echo(f"Query plan check only supports SQLite (current: {db.engine.dialect.name}).")
+        return
+    failures = 0
+    for name, query in hot_asset_queries().items():
+        plan = explain_query_plan(query)
+        scans = find_full_scans(plan, PLAN_CHECKED_TABLES)
+        click.echo(f"[{'FAIL' if scans else 'ok'}] {name}: {' | '.join(plan)}")
+        failures += bool(scans)
+    if failures:
+        raise click.ClickException(f"{failures} hot queries use a full table scan.")
+    click.echo("All hot queries use indexes.")
+
+@app.cli.command('seed-data')
+@click.option('--assets', default=200_000, show_default=True, help='Number of assets to generate.')
+@click.option('--users', default=20_000, show_default=True, help='Number of users to generate.')
+@click.option('--seed', default=42, show_default=True, help='Random seed, for repeatable data sets.')
+@click.option('--assigned-ratio', default=0.65, show_default=True, help='Share of assets assigned to a user.')
+def seed_data_command(assets, users, seed, assigned_ratio):
+    """
+    Fills the database with synthetic categories, locations, users and assets for load testing.
+    """
+    import seed_data # Imported here, like benchmark, to keep it out of the web app
+    started = datetime.now()
+    counts = seed_data.seed_synthetic_data(assets=assets, users=users, seed=seed,
+                                           assigned_ratio=assigned_ratio, log=click.echo)
+    click.echo(f"Seeded {counts} in {(datetime.now() - started).total_seconds():.1f}s.")
+
+@app.cli.command('bench')
+@click.option('--iterations', default=20, show_default=True, help='Measured requests per route.')
+@click.option('--only', multiple=True, help='Only run scenarios whose name contains this text (repeatable).')
+@click.option('--with-cache', is_flag=True, help='Keep the response cache on (measures cache hits).')
+@click.option('--save-baseline', type=click.Path(dir_okay=False), help='Write results to this JSON file.')
+@click.option('--compare', type=click.Path(exists=True, dir_okay=False), help='Compare with a saved baseline.')
+@click.option('--tolerance', default=0.25, show_default=True, help='Allowed p95 growth before flagging a regression.')
+def bench_command(iterations, only, with_cache, save_baseline, compare, tolerance):
+    """
+    Benchmarks every /api route: p50/p95/p99 latency, queries per request and peak RSS.
+    """
+    import benchmark # Imported here so the web app does not depend on the harness
+    logging.getLogger().setLevel(logging.WARNING) # Keep per-request INFO lines out of the report
+    backend = response_cache.backend
+    if not with_cache:
+        response_cache.backend = None
+    try:
+        results = benchmark.run_benchmarks(app, iterations=iterations, only=only, log=click.echo)
+    finally:
+        response_cache.backend = backend
+    if save_baseline:
+        benchmark.save_baseline(results, save_baseline, {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'iterations': iterations,
+            'assets': Asset.query.count(),
+            'database': db.engine.url.render_as_string(hide_password=True),
+        })
+        click.echo(f"Baseline saved to {save_baseline}.")
+    if compare:
+        regressions = benchmark.compare_to_baseline(results, compare, tolerance=tolerance, log=click.echo)
+        if regressions:
+            raise click.ClickException(f"{len(regressions)} routes regressed against {compare}.")
+        click.echo("No regressions against baseline.")
+
+@app.cli.command('bench-json')
+@click.option('--iterations', default=10, show_default=True, help='Measured runs per encoder.')
+def bench_json_command(iterations):
+    """
+    Compares the JSON serialization share of the full asset list before (stdlib encoder,
+    per-field isoformat) and after (the configured JSON provider).
+    """
+    import benchmark
+    benchmark.profile_serialization(app, lambda: asset_rows_query().all(), serialize_asset_row,
+                                    iterations=iterations, log=click.echo)
+
+def create_database():
+    """
+    Creates missing tables without migrations, plus what the migrations add beyond the
+    models: the FTS index and its triggers, and the table_version rows.
+    """
+    db.create_all()
+    asset_search.create_asset_search_index()
+    seed_table_versions()
+
+@app.cli.command('create-db')
+def create_db_command():
+    """
+    Creates the database from the models (db.create_all), as running app.py directly does.
+    Use `flask db upgrade` for databases that will be migrated later.
+    """
+    create_database()
+    click.echo("Database tables checked/created.")
+
+@app.cli.command('check-query-budgets')
+@click.option('--assets', default=2000, show_default=True, help='Assets seeded for the second pass.')
+@click.option('--iterations', default=2, show_default=True, help='Requests per route and pass.')
+def check_query_budgets_command(assets, iterations):
+    """
+    Runs every bench scenario with QUERY_BUDGET_MODE=raise against scratch SQLite databases
+    built both ways (flask db upgrade and flask create-db), first empty and then seeded.
+    Fails if any route answers with a server error, such as an exceeded budget.
+    """
+    def flask(env, *args):
+        result = subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', *args], env=env,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+        if result.returncode != 0:
+            raise click.ClickException(f"flask {' '.join(args)} failed:\n{result.stderr[-2000:]}")
+
+    failures = []
+    for setup, init_args in (('migrations', ('db', 'upgrade')), ('create_all', ('create-db',))):
+        with tempfile.TemporaryDirectory() as scratch:
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(scratch, 'budget.db')}",
+                       QUERY_BUDGET_MODE='raise', JOB_SCHEDULER='off')
+            flask(env, *init_args)
+            for data in ('empty', 'seeded'):
+                if data == 'seeded':
+                    flask(env, 'seed-data', '--assets', str(assets), '--users', str(max(1, assets // 10)))
+                results_path = os.path.join(scratch, f"{data}.json")
+                flask(env, 'bench', '--iterations', str(iterations), '--save-baseline', results_path)
+                with open(results_path) as handle:
+                    results = json.load(handle)['results']
+                for name, stats in sorted(results.items()):
+                    errors = {code: count for code, count in stats['statuses'].items() if int(code) >= 500}
+                    if stats['warmup_status'] >= 500:
+                        errors['warm-up'] = stats['warmup_status']
+                    click.echo(f"[{'FAIL' if errors else 'ok'}] {setup}/{data} {name}: {stats['queries_per_request']} q/req")
+                    if errors:
+                        failures.append(f"{setup}/{data} {name} {errors}")
+    if failures:
+        raise click.ClickException(f"{len(failures)} routes failed in raise mode: " + '; '.join(failures))
+    click.echo("All routes stay within their query budgets on both database setups.")
+
 if __name__ == '__main__':
     # This block ensures that the database tables are created when you run app.py directly.
     # It needs to be inside an application context.
     with app.app_context():
-        db.create_all() 
+        create_database()
         app.logger.info("Database tables checked/created.")
     app.run(debug=True)
@@ -0,0 +1,272 @@
+# backend/asgi.py
+
+# ASGI entry point: `uvicorn asgi:application --workers 4` (run from backend/).
+#
+# The read routes dashboards poll - the asset list, export and detail, the user list and
+# the report summary - are served by async handlers on an async engine and session
+# (aiosqlite locally, asyncpg/aiomysql on a server database; see db_config.py), so a slow
+# query waits on the event loop instead of holding a worker thread. Every other request
+# (writes, imports, the change feed, live events, /metrics) is passed to the Flask app
+# unchanged, through a thread pool.
+#
+# The async routes reuse the models and the query builders of app.py, return the same
+# payloads, ETags and X-Next-Cursor headers, and share the response cache and its keys.
+# The sqlite cache backend blocks on file I/O (and the memory one on its lock), so lookups
+# and stores run in the thread pool.
+# Flask's request metrics and query budgets only see the requests Flask serves.
+#
+# Requires: pip install starlette uvicorn a2wsgi aiosqlite 'sqlalchemy[asyncio]' (greenlet,
+# which the async engine needs; plus asyncpg or aiomysql for a server database).
+import contextlib
+
+from a2wsgi import WSGIMiddleware
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Match, Route
+from werkzeug.datastructures import MIMEAccept, MultiDict
+from werkzeug.http import parse_accept_header, parse_etags
+
+from app import (EXPORT_BATCH_SIZE, app as flask_app, apply_asset_filters, apply_asset_ordering,
+                 asset_rows_select, asset_summary_selects, build_asset_summary, encode_asset_columns,
+                 encode_asset_cursor, parse_asset_fields, parse_asset_sort, parse_page_size,
+                 response_cache, serialize_asset_row, serialize_user)
+from change_versions import format_version_tag
+from db_config import async_database_url, register_sqlite_tuning
+from extensions import db
+from models import Asset, TableVersion, User
+
+logger = flask_app.logger
+
+with flask_app.app_context():
+    # Built from the resolved sync URL so relative SQLite paths point at the same file
+    async_engine = create_async_engine(
+        async_database_url(db.engine.url), **flask_app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+register_sqlite_tuning(async_engine.sync_engine)
+AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+ASSET_LIST_TABLES = ('asset', 'category', 'location', 'user')
+
+def query_args(request):
+    """
+    The query string as a werkzeug MultiDict, the shape the app.py helpers expect.
+    """
+    return MultiDict(request.query_params.multi_items())
+
+async def version_tag(session, tables, daily=False):
+    """
+    Async counterpart of change_versions.version_tag().
+    """
+    rows = await session.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(tables)))
+    return format_version_tag(tables, dict(rows.all()), daily)
+
+def not_modified(request, tag):
+    return parse_etags(request.headers.get('if-none-match')).contains_weak(tag)
+
+def json_response(data, tag=None, headers=None):
+    response = Response(flask_app.json.dumps(data), media_type='application/json', headers=headers)
+    if tag is not None:
+        response.headers['ETag'] = f'W/"{tag}"'
+    return response
+
+async def cached_json(request, session, tables, daily, vary, build):
+    """
+    Serves a GET through the shared response cache and weak ETags, like the
+    etag_from_versions and response_cache.cached decorators do for the Flask views.
+    build() returns (data, extra headers). vary also names the headers sent as Vary.
+    """
+    tag = await version_tag(session, tables, daily)
+    varied = {'Vary': ', '.join(vary)} if vary else {}
+    if not_modified(request, tag):
+        return Response(status_code=304, headers={'ETag': f'W/"{tag}"', **varied})
+    key = response_cache.build_key(
+        request.url.path, request.query_params.multi_items(),
+        [request.headers.get(header, '') for header in vary], tag)
+    cached = await run_in_threadpool(response_cache.lookup, key)
+    if cached is not None:
+        body, status, headers = cached
+        response = Response(body, status_code=status)
+        response.headers.update({name: value for name, value in headers if name.lower() != 'etag'})
+        response.headers['ETag'] = f'W/"{tag}"'
+        response.headers.update(varied)
+        return response
+
+    data, headers = await build()
+    response = json_response(data, tag, {**headers, **varied})
+    await run_in_threadpool(response_cache.store, key, response.body, [
+        (name, value) for name, value in response.headers.items() if name.lower() not in ('content-length', 'etag')
+    ], tables)
+    return response
+
+def stream_asset_rows(stmt, fields=None):
+    """
+    Async counterpart of app.stream_asset_rows(): NDJSON fed from a server-side cursor.
+    """
+    async def generate():
+        count = 0
+        async with AsyncSession() as session:
+            result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for row in result:
+                count += 1
+                yield flask_app.json.dumps(serialize_asset_row(row, fields)) + '\n'
+        logger.info(f"Successfully streamed {count} assets.")
+    return StreamingResponse(generate(), media_type='application/x-ndjson')
+
+# --- ASSET ROUTES ---
+async def get_assets(request):
+    """
+    Async GET /api/assets: same filters, ?sort=, ?limit=/?cursor=, ?fields=, ?format= and
+    NDJSON negotiation as app.get_assets().
+    """
+    try:
+        args = query_args(request)
+        sort_param = args.get('sort', 'id')
+        limit = parse_page_size(args.get('limit'))
+        fields = parse_asset_fields(args.get('fields'))
+        response_format = args.get('format', 'rows')
+        if response_format not in ('rows', 'columnar'):
+            raise ValueError("format must be 'rows' or 'columnar'.")
+        selected = fields + [key for key in ('id', parse_asset_sort(sort_param)[0]) if key not in fields]
+        stmt = apply_asset_filters(asset_rows_select(selected), args)
+        stmt = apply_asset_ordering(stmt, sort_param, args.get('cursor'))
+        accept = parse_accept_header(request.headers.get('accept'), MIMEAccept)
+        if limit is None and response_format == 'rows' and accept.best_match(
+                ['application/json', 'application/x-ndjson']) == 'application/x-ndjson':
+            response = stream_asset_rows(stmt, fields)
+            response.headers['Vary'] = 'Accept' # Same URL as the JSON list below
+            return response
+        if limit is not None:
+            stmt = stmt.limit(limit + 1)
+
+        async with AsyncSession() as session:
+            async def build():
+                rows = (await session.execute(stmt)).all()
+                headers = {}
+                if limit is not None and len(rows) > limit:
+                    rows = rows[:limit]
+                    headers['X-Next-Cursor'] = encode_asset_cursor(sort_param, rows[-1])
+                logger.info(f"Successfully retrieved {len(rows)} assets.")
+                if response_format == 'columnar':
+                    return encode_asset_columns(rows, fields), headers
+                return [serialize_asset_row(row, fields) for row in rows], headers
+            return await cached_json(request, session, ASSET_LIST_TABLES, True, ('Accept',), build)
+    except ValueError as e:
+        logger.warning(f"Invalid asset list parameters: {e}")
+        return JSONResponse({'error': str(e)}, status_code=400)
+    except Exception as e:
+        logger.error(f"Error retrieving assets: {e}", exc_info=True)
+        return JSONResponse({'error': f"Failed to retrieve assets: {str(e)}"}, status_code=500)
+
+async def export_assets(request):
+    """
+    Async GET /api/assets/export.
+    """
+    try:
+        args = query_args(request)
+        fields = parse_asset_fields(args.get('fields'))
+        stmt = apply_asset_filters(asset_rows_select(fields), args)
+        return stream_asset_rows(apply_asset_ordering(stmt, args.get('sort', 'id')), fields)
+    except ValueError as e:
+        logger.warning(f"Invalid asset export parameters: {e}")
+        return JSONResponse({'error': str(e)}, status_code=400)
+    except Exception as e:
+        logger.error(f"Error exporting assets: {e}", exc_info=True)
+        return JSONResponse({'error': f"Failed to export assets: {str(e)}"}, status_code=500)
+
+async def get_asset(request):
+    """
+    Async GET /api/assets/<id>.
+    """
+    asset_id = request.path_params['id']
+    try:
+        async with AsyncSession() as session:
+            row = (await session.execute(asset_rows_select().where(Asset.id == asset_id))).first()
+        if row is None:
+            logger.warning(f"Asset not found with ID: {asset_id}")
+            return JSONResponse({'error': 'Asset not found'}, status_code=404)
+        logger.info(f"Successfully retrieved asset with ID: {asset_id}")
+        return json_response(serialize_asset_row(row))
+    except Exception as e:
+        logger.error(f"Error retrieving asset {asset_id}: {e}", exc_info=True)
+        return JSONResponse({'error': f"Failed to retrieve asset: {str(e)}"}, status_code=500)
+
+# --- REPORT ROUTES ---
+async def get_report_summary(request):
+    """
+    Async GET /api/reports/summary: the aggregates of app.compute_asset_summary(), run on
+    the async session.
+    """
+    try:
+        totals, breakdowns = asset_summary_selects(query_args(request))
+        async with AsyncSession() as session:
+            async def build():
+                totals_row = (await session.execute(totals)).one()
+                summary = build_asset_summary(
+                    totals_row, {key: (await session.execute(stmt)).all() for key, stmt in breakdowns.items()})
+                logger.info(f"Successfully computed report summary over {summary['total_assets']} assets.")
+                return summary, None
+            return await cached_json(request, session, ASSET_LIST_TABLES, True, (), build)
+    except ValueError as e:
+        logger.warning(f"Invalid report summary parameters: {e}")
+        return JSONResponse({'error': str(e)}, status_code=400)
+    except Exception as e:
+        logger.error(f"Error computing report summary: {e}", exc_info=True)
+        return JSONResponse({'error': f"Failed to compute report summary: {str(e)}"}, status_code=500)
+
+# --- USER ROUTES ---
+async def get_users(request):
+    """
+    Async GET /api/users.
+    """
+    try:
+        async with AsyncSession() as session:
+            async def build():
+                users = (await session.scalars(select(User))).all()
+                logger.info(f"Successfully retrieved {len(users)} users.")
+                return [serialize_user(user) for user in users], None
+            return await cached_json(request, session, ('user',), False, (), build)
+    except Exception as e:
+        logger.error(f"Error retrieving users: {e}", exc_info=True)
+        return JSONResponse({'error': f"Failed to retrieve users: {str(e)}"}, status_code=500)
+
+# --- APPLICATION ---
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    await async_engine.dispose()
+
+async_routes = [
+    Route('/api/assets', get_assets, methods=['GET']),
+    Route('/api/assets/export', export_assets, methods=['GET']),
+    Route('/api/assets/{id:int}', get_asset, methods=['GET']),
+    Route('/api/reports/summary', get_report_summary, methods=['GET']),
+    Route('/api/users', get_users, methods=['GET']),
+]
+
+async_app = Starlette(
+    routes=async_routes,
+    lifespan=lifespan,
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'],
+                           expose_headers=['X-Next-Cursor', 'ETag']),
+                # Flask's ResponseCompression covers the passed-through routes; gzip only here
+                Middleware(GZipMiddleware, minimum_size=flask_app.config['COMPRESSION_MIN_SIZE'],
+                           compresslevel=flask_app.config['COMPRESSION_GZIP_LEVEL'])],
+)
+wsgi_app = WSGIMiddleware(flask_app)
+
+async def application(scope, receive, send):
+    """
+    Sends lifespan events and fully matching async routes to async_app and everything
+    else (other methods on the same paths, CORS preflights, all other routes) to Flask.
+    """
+    if scope['type'] == 'lifespan' or (
+            scope['type'] == 'http' and any(route.matches(scope)[0] == Match.FULL for route in async_routes)):
+        await async_app(scope, receive, send)
+    else:
+        await wsgi_app(scope, receive, send)
@@ -0,0 +1,294 @@
+# backend/asset_events.py
+
+# Live asset events pushed to dashboards over Server-Sent Events (GET /api/assets/events).
+#
+# Session listeners note, per transaction, which assets were created, which changed
+# status (and from what) and what deleted assets looked like. After the transaction
+# commits, the change log hands over its entries (see change_log.on_rows_committed) and a
+# single publisher thread turns them into events: one SELECT per commit loads the current
+# rows, and every connected client receives the events that match its filters from an
+# in-memory queue. Clients never cost a database query of their own, and when nobody is
+# connected nothing is loaded at all.
+#
+# By the time the publisher runs, a row may have changed again. The fields subscribers
+# filter on (status, category, location) are therefore captured as the transaction wrote
+# them and override the loaded row. Events report, and are filtered on, the state at their
+# commit; the remaining fields are the row's current values.
+#
+# Each event's SSE id is its change log sequence number, so a client that reconnects can
+# backfill what it missed from GET /api/assets/changes?since=<last event id>.
+# Events come from commits made by this process; run one worker per host or point
+# dashboards at the change feed if several processes write.
+import queue
+import threading
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from change_log import on_rows_committed # Imported first so its commit listeners run before ours
+from extensions import db
+from json_provider import dumps as json_dumps
+from models import Asset, Category, Location
+
+EVENT_QUEUE_SIZE = 1000 # Events buffered per client before it is dropped as too slow
+HEARTBEAT_SECONDS = 15 # Comment line sent on idle streams so proxies keep them open
+RETRY_MILLISECONDS = 5000 # Reconnect delay suggested to EventSource clients
+
+_CREATED_KEY = 'asset_events_created'
+_PREVIOUS_STATUS_KEY = 'asset_events_previous_status'
+_DELETED_KEY = 'asset_events_deleted'
+_WRITTEN_VALUES_KEY = 'asset_events_written_values'
+_COMMITTING_KEY = 'asset_events_committing'
+EVENT_FIELDS = ('status', 'category_id', 'location_id') # Captured at write time, see above
+
+def record_previous_statuses(session, previous_by_id):
+    """
+    Notes the status assets had before a bulk UPDATE the unit of work cannot see, so the
+    stream can report them as status changes.
+    """
+    previous = session.info.setdefault(_PREVIOUS_STATUS_KEY, {})
+    for asset_id, status in previous_by_id.items():
+        previous.setdefault(asset_id, status)
+
+def record_written_values(session, values_by_id):
+    """
+    Notes the EVENT_FIELDS values assets were written with ({id: {field: value}}), for
+    writes the unit of work cannot see. Later writes in the transaction take precedence.
+    """
+    written = session.info.setdefault(_WRITTEN_VALUES_KEY, {})
+    for asset_id, values in values_by_id.items():
+        written.setdefault(asset_id, {}).update(
+            (field, value) for field, value in values.items() if field in EVENT_FIELDS)
+
+def record_created_assets(session, asset_ids):
+    """
+    Notes assets inserted outside the unit of work (a Core INSERT) as created.
+    """
+    session.info.setdefault(_CREATED_KEY, set()).update(asset_ids)
+
+@event.listens_for(Session, 'after_flush')
+def _collect_asset_details(session, flush_context):
+    for obj in session.new:
+        if isinstance(obj, Asset):
+            record_created_assets(session, [obj.id])
+    for obj in session.dirty:
+        if isinstance(obj, Asset):
+            history = inspect(obj).attrs.status.history
+            if history.deleted:
+                record_previous_statuses(session, {obj.id: history.deleted[0]})
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Asset):
+            loaded = inspect(obj).dict # Loaded values only; reading an expired one would query
+            record_written_values(session, {obj.id: {field: loaded[field] for field in EVENT_FIELDS if field in loaded}})
+    for obj in session.deleted:
+        if isinstance(obj, Asset):
+            session.info.setdefault(_DELETED_KEY, {})[obj.id] = {
+                'id': obj.id, 'asset_code': obj.asset_code, 'status': obj.status,
+                'category_id': obj.category_id, 'location_id': obj.location_id,
+            }
+
+@event.listens_for(Session, 'before_commit')
+def _stage_asset_details(session):
+    if session.in_nested_transaction():
+        return # Savepoint release; staged with the outer commit
+    session.flush()
+    # Moved aside so a commit with no asset rows does not carry them into the next one
+    session.info[_COMMITTING_KEY] = (
+        session.info.pop(_CREATED_KEY, set()),
+        session.info.pop(_PREVIOUS_STATUS_KEY, {}),
+        session.info.pop(_DELETED_KEY, {}),
+        session.info.pop(_WRITTEN_VALUES_KEY, {}),
+    )
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_asset_details(session, previous_transaction):
+    if previous_transaction.parent is not None:
+        return
+    for key in (_CREATED_KEY, _PREVIOUS_STATUS_KEY, _DELETED_KEY, _WRITTEN_VALUES_KEY, _COMMITTING_KEY):
+        session.info.pop(key, None)
+
+def format_sse(event_type, data, event_id=None):
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json_dumps(data)}")
+    return '\n'.join(lines) + '\n\n'
+
+class _Subscriber:
+    def __init__(self, filters):
+        self.filters = filters # field -> set of accepted values
+        self.events = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self.overflowed = False
+
+    def matches(self, asset, previous_status=None):
+        for field, accepted in self.filters.items():
+            if asset.get(field) not in accepted and not (field == 'status' and previous_status in accepted):
+                return False
+        return True
+
+class AssetEventBroker:
+    """
+    Fans committed asset changes out to SSE subscribers. Call init_app(app, load_rows) once.
+    """
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._work = queue.Queue()
+        self._thread = None
+        self.app = None
+        self.load_rows = None
+
+    def init_app(self, app, load_rows):
+        """
+        load_rows(ids) must return {id: serialized asset} for the assets that still exist.
+        """
+        self.app = app
+        self.load_rows = load_rows
+        on_rows_committed(self._on_rows_committed)
+
+    # --- Subscriptions ---
+    def subscribe(self, filters):
+        subscriber = _Subscriber(filters)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._publish_forever, name='asset-events', daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def stats(self):
+        with self._lock:
+            return {'subscribers': len(self._subscribers), 'pending_commits': self._work.qsize()}
+
+    def stream(self, subscriber):
+        """
+        Generator of SSE text for one subscriber; unsubscribes when the client goes away.
+        """
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+            while True:
+                try:
+                    chunk = subscriber.events.get(timeout=HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if chunk is None: # Dropped for falling behind
+                    yield format_sse('resync', {'reason': 'Client fell behind; reload via /api/assets/changes.'})
+                    return
+                yield chunk
+        finally:
+            self.unsubscribe(subscriber)
+
+    # --- Publishing ---
+    def _on_rows_committed(self, session, entries):
+        # Runs in the committing request; keep it to a queue put
+        created, previous, deleted, written = session.info.pop(_COMMITTING_KEY, (set(), {}, {}, {}))
+        if not self._subscribers:
+            return
+        asset_entries = [entry for entry in entries if entry[1] == Asset.__tablename__]
+        if asset_entries:
+            self._work.put((asset_entries, created, previous, deleted, written))
+
+    def _publish_forever(self):
+        while True:
+            work = self._work.get()
+            try:
+                with self.app.app_context():
+                    events = self._build_events(*work)
+            except Exception as e:
+                self.app.logger.error(f"Failed to build asset events: {e}", exc_info=True)
+                continue
+            self._fan_out(events)
+
+    def _build_events(self, entries, created, previous, deleted, written):
+        """
+        Returns [(sse_text, asset, previous_status)], loading all upserted rows in one query.
+        """
+        upsert_ids = [row_id for _, _, row_id, operation in entries if operation == 'upsert']
+        rows = self.load_rows(upsert_ids) if upsert_ids else {}
+        # Category/location names needed for deleted assets and for written ids that differ from the current row
+        wanted = {'category': set(), 'location': set()}
+        for snapshot in deleted.values():
+            wanted['category'].add(snapshot['category_id'])
+            wanted['location'].add(snapshot['location_id'])
+        for row_id, values in written.items():
+            for kind in wanted:
+                key = f"{kind}_id"
+                if key in values and row_id in rows and values[key] != rows[row_id].get(key):
+                    wanted[kind].add(values[key])
+        names = {}
+        if wanted['category']:
+            names['category'] = dict(db.session.query(Category.id, Category.name).filter(
+                Category.id.in_(wanted['category'])))
+        if wanted['location']:
+            names['location'] = dict(db.session.query(Location.id, Location.name).filter(
+                Location.id.in_(wanted['location'])))
+
+        events = []
+        for sequence, _, row_id, operation in entries:
+            if operation == 'reset':
+                events.append((format_sse('resync', {'reason': 'Assets were changed in bulk.'}, sequence), None, None))
+            elif operation == 'delete':
+                snapshot = deleted.get(row_id, {'id': row_id})
+                asset = {
+                    'id': row_id,
+                    'asset_code': snapshot.get('asset_code'),
+                    'status': snapshot.get('status'),
+                    'category_name': names.get('category', {}).get(snapshot.get('category_id')),
+                    'location_name': names.get('location', {}).get(snapshot.get('location_id')),
+                }
+                events.append((format_sse('asset.deleted', asset, sequence), asset, None))
+            elif row_id in rows:
+                asset = self._as_written(rows[row_id], written.get(row_id, {}), names)
+                if row_id in created:
+                    events.append((format_sse('asset.created', asset, sequence), asset, None))
+                elif row_id in previous and previous[row_id] != asset.get('status'):
+                    data = {**asset, 'previous_status': previous[row_id]}
+                    events.append((format_sse('asset.status_changed', data, sequence), asset, previous[row_id]))
+                else:
+                    events.append((format_sse('asset.updated', asset, sequence), asset, None))
+        return events
+
+    @staticmethod
+    def _as_written(asset, values, names):
+        """
+        Overrides the loaded row's EVENT_FIELDS (and the matching names) with the values
+        its transaction wrote.
+        """
+        asset = dict(asset)
+        if 'status' in values:
+            asset['status'] = values['status']
+        for kind in ('category', 'location'):
+            key = f"{kind}_id"
+            if key in values and values[key] != asset.get(key):
+                asset[key] = values[key]
+                asset[f"{kind}_name"] = names.get(kind, {}).get(values[key])
+        return asset
+
+    def _fan_out(self, events):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            if subscriber.overflowed:
+                continue
+            for text, asset, previous_status in events:
+                if asset is not None and not subscriber.matches(asset, previous_status):
+                    continue
+                try:
+                    subscriber.events.put_nowait(text)
+                except queue.Full:
+                    subscriber.overflowed = True
+                    self._drop(subscriber)
+                    break
+
+    def _drop(self, subscriber):
+        self.unsubscribe(subscriber)
+        try:
+            subscriber.events.get_nowait() # Make room for the sentinel
+        except queue.Empty:
+            pass
+        subscriber.events.put_nowait(None)
@@ -0,0 +1,269 @@
+# backend/asset_import.py
+
+# Bulk asset import used by POST /api/assets/import.
+# Rows are validated one at a time and inserted in batches of one multi-row INSERT each,
+# resolving category and location names against maps loaded once per import instead
+# of running get_or_create_* (and its commits) for every row. Validation checks every
+# value's type and length, so a bad row is reported on its own instead of failing the
+# INSERT for its whole batch.
+import csv
+import io
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+
+from asset_events import record_created_assets, record_written_values
+from change_log import record_row_changes
+from change_versions import mark_tables_changed
+from extensions import db
+from models import Asset, Category, Location, User
+from query_budget import count_query_batch
+
+IMPORT_BATCH_SIZE = 1000
+
+# Optional text columns copied straight from the input row
+TEXT_FIELDS = (
+    'asset_type', 'asset_description', 'make', 'model', 'department',
+    'division', 'plant_code',
+)
+
+def iter_csv_rows(stream):
+    """
+    Yields (row_number, row_dict) from a binary CSV stream without reading it all into memory.
+    Row numbers count data rows from 1, excluding the header.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    for row_number, row in enumerate(reader, start=1):
+        yield row_number, row
+
+def iter_json_rows(items):
+    """
+    Yields (row_number, row_dict) from a decoded JSON array.
+    """
+    for row_number, item in enumerate(items, start=1):
+        yield row_number, item
+
+def _clean(value):
+    """
+    Normalizes an input cell: strips strings and turns empty values into None.
+    """
+    if isinstance(value, str):
+        value = value.strip()
+    return value if value not in ('', None) else None
+
+def _parse_text(row, field, max_length):
+    """
+    Returns a text cell as a stripped string, or None. Numbers are accepted as their text;
+    other JSON values (objects, lists, booleans) raise ValueError.
+    """
+    value = _clean(row.get(field))
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"{field} must be a string.")
+    value = str(value)
+    if max_length is not None and len(value) > max_length:
+        raise ValueError(f"{field} must be at most {max_length} characters.")
+    return value
+
+def _column_length(model, field):
+    return model.__table__.c[field].type.length
+
+def _parse_date(row, field):
+    value = _clean(row.get(field))
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)).date()
+    except ValueError:
+        raise ValueError(f"Invalid {field} format. Use YYYY-MM-DD.")
+
+def _parse_int(row, field):
+    value = _clean(row.get(field))
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an integer.")
+
+class _NameResolver:
+    """
+    Maps Category or Location names to ids from a table preloaded in memory.
+    Unknown names are created inside the import transaction, one INSERT per batch.
+    """
+
+    def __init__(self, model, detail_field, label):
+        self.model = model
+        self.detail_field = detail_field
+        self.label = label
+        self.ids = dict(db.session.query(model.name, model.id))
+        self.created = []
+
+    def create_missing(self, names):
+        """
+        Inserts the names not known yet with one multi-row INSERT ... RETURNING and returns
+        {name: id} for them. They are remembered only once passed to keep(), so names whose
+        savepoint rolls back are created again by a later batch.
+        """
+        missing = sorted({name for name in names if name not in self.ids})
+        if not missing:
+            return {}
+        table = self.model.__table__
+        result = db.session.connection().execute(
+            insert(table).returning(table.c.id, table.c.name),
+            [{'name': name, self.detail_field: f"Auto-created {self.label}: {name}"} for name in missing],
+        )
+        return dict((name, record_id) for record_id, name in result)
+
+    def keep(self, new_ids):
+        """
+        Remembers names returned by create_missing() and logs their rows as changed.
+        """
+        if not new_ids:
+            return
+        table = self.model.__table__
+        self.ids.update(new_ids)
+        self.created.extend(sorted(new_ids))
+        mark_tables_changed(db.session, table.name)
+        record_row_changes(db.session, table.name, 'upsert', list(new_ids.values()))
+
+    def resolve(self, name, new_ids):
+        return self.ids[name] if name in self.ids else new_ids[name]
+
+def _build_mapping(row, user_ids):
+    """
+    Validates one input row and converts it to an Asset insert mapping that still carries
+    category_name and location_name. Raises ValueError.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("Each row must be an object.")
+    mapping = {}
+    for field, max_length in (('asset_code', _column_length(Asset, 'asset_code')),
+                              ('serial_number', _column_length(Asset, 'serial_number')),
+                              ('category_name', _column_length(Category, 'name')),
+                              ('location_name', _column_length(Location, 'name'))):
+        mapping[field] = _parse_text(row, field, max_length)
+        if mapping[field] is None:
+            raise ValueError(f"Missing required field: '{field}'")
+
+    mapping['capital_date'] = _parse_date(row, 'capital_date')
+    mapping['expiry_date'] = _parse_date(row, 'expiry_date')
+    mapping['year'] = _parse_int(row, 'year')
+    mapping['user_id'] = _parse_int(row, 'user_id')
+    if mapping['user_id'] is not None and mapping['user_id'] not in user_ids:
+        raise ValueError(f"User {mapping['user_id']} does not exist.")
+    for field in TEXT_FIELDS:
+        mapping[field] = _parse_text(row, field, _column_length(Asset, field))
+    mapping['status'] = _parse_text(row, 'status', _column_length(Asset, 'status')) or 'Active'
+    mapping['warranty_status'] = _parse_text(
+        row, 'warranty_status', _column_length(Asset, 'warranty_status')) or 'In Warranty'
+    return mapping
+
+def _flush_batch(batch, errors, categories, locations):
+    """
+    Inserts a batch of (row_number, mapping) pairs. Rows whose asset_code or serial_number
+    already exist are reported as errors. The rest go in with one multi-row INSERT ... RETURNING
+    inside a savepoint, together with the categories and locations they name that do not
+    exist yet, so a failing batch leaves neither assets nor new names behind and does not
+    undo earlier batches. Returns rows inserted.
+    """
+    count_query_batch()
+    codes = [mapping['asset_code'] for _, mapping in batch]
+    serials = [mapping['serial_number'] for _, mapping in batch]
+    taken_codes = {code for (code,) in db.session.query(Asset.asset_code).filter(Asset.asset_code.in_(codes))}
+    taken_serials = {serial for (serial,) in db.session.query(Asset.serial_number).filter(Asset.serial_number.in_(serials))}
+
+    rows = []
+    for row_number, mapping in batch:
+        if mapping['asset_code'] in taken_codes:
+            errors.append({'row': row_number, 'error': f"asset_code '{mapping['asset_code']}' already exists."})
+        elif mapping['serial_number'] in taken_serials:
+            errors.append({'row': row_number, 'error': f"serial_number '{mapping['serial_number']}' already exists."})
+        else:
+            rows.append((row_number, mapping))
+    if not rows:
+        return 0
+
+    try:
+        with db.session.begin_nested():
+            new_categories = categories.create_missing(mapping['category_name'] for _, mapping in rows)
+            new_locations = locations.create_missing(mapping['location_name'] for _, mapping in rows)
+            for _, mapping in rows:
+                mapping['category_id'] = categories.resolve(mapping.pop('category_name'), new_categories)
+                mapping['location_id'] = locations.resolve(mapping.pop('location_name'), new_locations)
+            table = Asset.__table__
+            # Through the Connection, so the ORM bulk-statement hooks do not log a table reset.
+            # SQLite only guarantees RETURNING order one row per statement, so the new ids are
+            # matched back to their rows by the unique asset_code rather than by position.
+            result = db.session.connection().execute(
+                insert(table).returning(table.c.id, table.c.asset_code),
+                [mapping for _, mapping in rows],
+            )
+            ids_by_code = dict((code, asset_id) for asset_id, code in result)
+            mark_tables_changed(db.session, Asset.__tablename__)
+            new_ids = [ids_by_code[mapping['asset_code']] for _, mapping in rows]
+            record_row_changes(db.session, Asset.__tablename__, 'upsert', new_ids)
+            record_created_assets(db.session, new_ids)
+            record_written_values(db.session, {asset_id: mapping for asset_id, (_, mapping) in zip(new_ids, rows)})
+    except Exception as e:
+        current_app.logger.error(f"Asset import batch failed: {e}", exc_info=True)
+        # The full message carries the SQL and every row's parameters; keep the driver's reason only
+        reason = type(e).__name__
+        if isinstance(e, DBAPIError) and str(e.orig):
+            reason = str(e.orig).splitlines()[0]
+        first, last = rows[0][0], rows[-1][0]
+        errors.extend({'row': row_number, 'error': f"Not inserted: the batch of rows {first}-{last} failed ({reason})."}
+                      for row_number, _ in rows)
+        return 0
+    categories.keep(new_categories)
+    locations.keep(new_locations)
+    return len(rows)
+
+def import_assets(rows, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Imports an iterable of (row_number, row_dict) pairs in one transaction.
+    Invalid rows are skipped and reported; valid rows are inserted in batches.
+    Returns a summary dict with inserted/failed counts and row-level errors.
+    The caller is responsible for committing or rolling back.
+    """
+    categories = _NameResolver(Category, 'description', 'category')
+    locations = _NameResolver(Location, 'address', 'location')
+    user_ids = {user_id for (user_id,) in db.session.query(User.id)}
+    seen_codes, seen_serials = set(), set()
+    errors, batch = [], []
+    inserted = total = 0
+
+    for row_number, row in rows:
+        total += 1
+        try:
+            mapping = _build_mapping(row, user_ids)
+        except ValueError as e:
+            errors.append({'row': row_number, 'error': str(e)})
+            continue
+        if mapping['asset_code'] in seen_codes:
+            errors.append({'row': row_number, 'error': f"Duplicate asset_code '{mapping['asset_code']}' in import."})
+            continue
+        if mapping['serial_number'] in seen_serials:
+            errors.append({'row': row_number, 'error': f"Duplicate serial_number '{mapping['serial_number']}' in import."})
+            continue
+        seen_codes.add(mapping['asset_code'])
+        seen_serials.add(mapping['serial_number'])
+        batch.append((row_number, mapping))
+        if len(batch) >= batch_size:
+            inserted += _flush_batch(batch, errors, categories, locations)
+            batch = []
+    if batch:
+        inserted += _flush_batch(batch, errors, categories, locations)
+
+    errors.sort(key=lambda error: error['row'])
+    return {
+        'total_rows': total,
+        'inserted': inserted,
+        'failed': len(errors),
+        'created_categories': categories.created,
+        'created_locations': locations.created,
+        'errors': errors,
+    }
@@ -0,0 +1,107 @@
+# backend/asset_search.py
+
+# SQLite FTS5 full-text index over assets, used by GET /api/assets/search.
+# asset_fts mirrors the searchable asset columns plus the assigned user's name, keyed by
+# rowid = asset.id, and is kept in sync by triggers on asset and "user". The schema is
+# created by migration 7b3d5f9e2c41; create_asset_search_index() builds the same objects
+# for databases created with db.create_all().
+import re
+
+from sqlalchemy import column, func, inspect, literal_column, table, text
+
+from extensions import db
+
+ASSET_FTS_COLUMNS = ('asset_code', 'serial_number', 'asset_description', 'make', 'model', 'user_name')
+# bm25 column weights, in ASSET_FTS_COLUMNS order: identifiers outrank free text
+ASSET_FTS_WEIGHTS = (10.0, 10.0, 1.0, 2.0, 2.0, 3.0)
+
+asset_fts = table('asset_fts', column('rowid'))
+
+ASSET_FTS_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS asset_fts USING fts5(
+        asset_code, serial_number, asset_description, make, model, user_name,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS asset_fts_ai AFTER INSERT ON asset BEGIN
+        INSERT INTO asset_fts (rowid, asset_code, serial_number, asset_description, make, model, user_name)
+        VALUES (new.id, new.asset_code, new.serial_number, new.asset_description, new.make, new.model,
+                (SELECT name FROM "user" WHERE id = new.user_id));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS asset_fts_au
+    AFTER UPDATE OF asset_code, serial_number, asset_description, make, model, user_id ON asset BEGIN
+        DELETE FROM asset_fts WHERE rowid = old.id;
+        INSERT INTO asset_fts (rowid, asset_code, serial_number, asset_description, make, model, user_name)
+        VALUES (new.id, new.asset_code, new.serial_number, new.asset_description, new.make, new.model,
+                (SELECT name FROM "user" WHERE id = new.user_id));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS asset_fts_ad AFTER DELETE ON asset BEGIN
+        DELETE FROM asset_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_fts_au AFTER UPDATE OF name ON "user" BEGIN
+        UPDATE asset_fts SET user_name = new.name WHERE rowid IN (SELECT id FROM asset WHERE user_id = new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_fts_ad AFTER DELETE ON "user" BEGIN
+        UPDATE asset_fts SET user_name = NULL WHERE rowid IN (SELECT id FROM asset WHERE user_id = old.id);
+    END""",
+)
+
+ASSET_FTS_BACKFILL = """
+    INSERT INTO asset_fts (rowid, asset_code, serial_number, asset_description, make, model, user_name)
+    SELECT asset.id, asset.asset_code, asset.serial_number, asset.asset_description, asset.make, asset.model, "user".name
+    FROM asset LEFT OUTER JOIN "user" ON "user".id = asset.user_id
+"""
+
+_available = None
+
+def search_index_available():
+    """
+    True when the database is SQLite and the asset_fts table exists. Checked once per process.
+    """
+    global _available
+    if _available is None:
+        _available = db.engine.dialect.name == 'sqlite' and inspect(db.engine).has_table('asset_fts')
+    return _available
+
+def create_asset_search_index():
+    """
+    Creates asset_fts and its triggers if missing and backfills it from the asset table.
+    """
+    global _available
+    if db.engine.dialect.name != 'sqlite':
+        return
+    with db.engine.begin() as connection:
+        existed = inspect(connection).has_table('asset_fts')
+        for statement in ASSET_FTS_DDL:
+            connection.execute(text(statement))
+        if not existed:
+            connection.execute(text(ASSET_FTS_BACKFILL))
+    _available = True
+
+def build_match_expression(search_text):
+    """
+    Turns free text into an FTS5 query that prefix-matches every word, e.g.
+    'dell xps' -> '"dell"* "xps"*'. Returns None when the text has no searchable words.
+    """
+    terms = re.findall(r'\w+', search_text)
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def match_clause(expression):
+    """
+    WHERE clause restricting asset_fts to rows matching an FTS5 expression.
+    """
+    return text('asset_fts MATCH :fts_query').bindparams(fts_query=expression)
+
+def rank_expression():
+    """
+    Weighted bm25 relevance for the current match; lower is better.
+    """
+    return func.bm25(literal_column('asset_fts'), *ASSET_FTS_WEIGHTS)
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Alembic autogenerate filter: asset_fts and its FTS5 shadow tables are managed by
+    migration 7b3d5f9e2c41, not by the models, so they must not be reported as removed.
+    """
+    return not (type_ == 'table' and name.startswith('asset_fts'))
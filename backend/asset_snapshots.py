@@ -0,0 +1,92 @@
+# backend/asset_snapshots.py
+
+# Daily pre-aggregated asset counts for trend reports.
+#
+# take_asset_summary_snapshot() runs one INSERT ... SELECT ... GROUP BY per dimension,
+# so the counts are computed and stored by the database without rows travelling through
+# Python. Each snapshot stores one row per (dimension, value):
+#   total       'all'
+#   status      Asset.status
+#   category    Category.name
+#   location    Location.name
+#   department  Asset.department
+#   warranty    expired / expiring_soon / in_warranty / no_expiry_date, by expiry_date
+#   assignment  assigned / unassigned
+# The background job scheduler takes one snapshot a day (see app.py). Taking it again on the
+# same day replaces that day's rows, so a rerun or a restart never produces duplicates.
+# read_asset_trend() then serves months of history from a few hundred rows.
+from datetime import date, timedelta
+
+from sqlalchemy import Date, String, case, delete, func, insert, literal, select
+
+from extensions import db
+from models import Asset, AssetSummarySnapshot, Category, Location
+
+SNAPSHOT_DIMENSIONS = ('total', 'status', 'category', 'location', 'department', 'warranty', 'assignment')
+
+def warranty_bucket(snapshot_date, expiring_soon_days):
+    """
+    The warranty bucket of each asset on snapshot_date, as a SQL expression.
+    """
+    soon = snapshot_date + timedelta(days=expiring_soon_days)
+    return case(
+        (Asset.expiry_date.is_(None), 'no_expiry_date'),
+        (Asset.expiry_date < snapshot_date, 'expired'),
+        (Asset.expiry_date <= soon, 'expiring_soon'),
+        else_='in_warranty',
+    )
+
+def snapshot_selects(snapshot_date, expiring_soon_days):
+    """
+    Returns {dimension: select(snapshot_date, dimension, name, asset_count)} with the rows
+    one snapshot stores for each dimension.
+    """
+    def counts(dimension, name, *joins):
+        stmt = select(literal(snapshot_date, Date), literal(dimension, String), name,
+                      func.count(Asset.id)).select_from(Asset)
+        for target, onclause in joins:
+            stmt = stmt.outerjoin(target, onclause)
+        return stmt.group_by(name)
+
+    return {
+        'total': counts('total', literal('all', String)),
+        'status': counts('status', Asset.status),
+        'category': counts('category', Category.name, (Category, Asset.category_id == Category.id)),
+        'location': counts('location', Location.name, (Location, Asset.location_id == Location.id)),
+        'department': counts('department', Asset.department),
+        'warranty': counts('warranty', warranty_bucket(snapshot_date, expiring_soon_days)),
+        'assignment': counts('assignment', case((Asset.user_id.is_(None), 'unassigned'), else_='assigned')),
+    }
+
+def take_asset_summary_snapshot(snapshot_date=None, expiring_soon_days=30):
+    """
+    Stores the counts for snapshot_date (default today), replacing any taken earlier that
+    day, in the current transaction (the caller commits). Returns the number of rows stored.
+    """
+    snapshot_date = snapshot_date or date.today()
+    db.session.execute(delete(AssetSummarySnapshot).where(AssetSummarySnapshot.snapshot_date == snapshot_date))
+    columns = ['snapshot_date', 'dimension', 'name', 'asset_count']
+    stored = 0
+    for stmt in snapshot_selects(snapshot_date, expiring_soon_days).values():
+        stored += db.session.execute(insert(AssetSummarySnapshot).from_select(columns, stmt)).rowcount
+    return stored
+
+def read_asset_trend(dimension, start, end):
+    """
+    Returns the snapshots of one dimension between start and end (inclusive) as
+    {'dates': [...], 'series': [{'name', 'counts'}]}. Counts line up with dates, and a
+    value missing from a snapshot counts as 0. Series are ordered by their latest count.
+    """
+    rows = db.session.execute(
+        select(AssetSummarySnapshot.snapshot_date, AssetSummarySnapshot.name, AssetSummarySnapshot.asset_count)
+        .where(AssetSummarySnapshot.dimension == dimension,
+               AssetSummarySnapshot.snapshot_date.between(start, end))
+        .order_by(AssetSummarySnapshot.snapshot_date)
+    ).all()
+    dates = sorted({snapshot_date for snapshot_date, _, _ in rows})
+    position = {snapshot_date: i for i, snapshot_date in enumerate(dates)}
+    series = {}
+    for snapshot_date, name, count in rows:
+        series.setdefault(name, [0] * len(dates))[position[snapshot_date]] = count
+    ordered = sorted(series.items(), key=lambda item: (-item[1][-1], item[0] is None, item[0] or ''))
+    return {'dates': dates, 'series': [{'name': name, 'counts': counts} for name, counts in ordered]}
@@ -0,0 +1,116 @@
+# backend/background_jobs.py
+
+# In-process runner for periodic maintenance jobs, such as the warranty status
+# reconciliation in warranty_reconcile.py.
+#
+# Jobs are registered with an interval. With JOB_SCHEDULER=on, the web process runs them
+# on one daemon thread, started by the first request it serves. Alternatively,
+# `flask run-jobs` runs the same loop in the foreground as a dedicated process, and
+# `flask run-jobs --once` runs every job once (for cron).
+# Each run commits its own transaction and is stored as a JobRun row with its duration,
+# the number of rows it changed and its error, if any.
+#
+# With several worker processes each one runs its own scheduler, so jobs must be
+# idempotent; prefer a single `flask run-jobs` process in that setup.
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import func
+
+from extensions import db
+from models import JobRun
+
+class _Job:
+    def __init__(self, name, func, interval):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.next_run = 0.0 # time.monotonic() at which the job is next due
+
+class JobScheduler:
+    """
+    Runs registered jobs every `interval` seconds. Call init_app(app) once, then add_job().
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.app = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def init_app(self, app):
+        app.config.setdefault('JOB_SCHEDULER', 'off')
+        self.app = app
+        if app.config['JOB_SCHEDULER'] == 'on':
+            app.before_request(self.start)
+
+    def add_job(self, name, func, interval):
+        """
+        Registers func() to run every `interval` seconds. func runs inside an app context,
+        may return the number of rows it changed, and must not commit; the runner does.
+        """
+        self.jobs[name] = _Job(name, func, interval)
+
+    # --- Running ---
+    def run_job(self, name):
+        """
+        Runs one job now, in the current app context, and returns its JobRun. A failure is
+        rolled back, logged and recorded rather than raised.
+        """
+        job = self.jobs[name]
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        try:
+            rows_affected = job.func()
+            db.session.commit()
+            error = None
+        except Exception as e:
+            db.session.rollback()
+            rows_affected, error = None, str(e)
+            self.app.logger.error(f"Job {name} failed: {e}", exc_info=True)
+        run = JobRun(job_name=name, started_at=started_at, duration_ms=round((time.perf_counter() - started) * 1000, 3),
+                     succeeded=error is None, rows_affected=rows_affected, error=error)
+        db.session.add(run)
+        db.session.commit()
+        if error is None:
+            self.app.logger.info(f"Job {name} finished in {run.duration_ms:.1f} ms, {rows_affected} rows changed.")
+        return run
+
+    def run_pending(self):
+        """
+        Runs every job whose interval has elapsed and returns the seconds until the next one is due.
+        """
+        for job in self.jobs.values():
+            if job.next_run <= time.monotonic():
+                job.next_run = time.monotonic() + job.interval
+                with self.app.app_context():
+                    self.run_job(job.name)
+        return max(0.0, min(job.next_run for job in self.jobs.values()) - time.monotonic())
+
+    def run_forever(self):
+        while self.jobs and not self._stopped.is_set():
+            self._stopped.wait(self.run_pending())
+
+    def start(self):
+        """
+        Starts the background thread (once). Registered as a before_request hook when enabled.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run_forever, name='background-jobs', daemon=True)
+                self._thread.start()
+                self.app.logger.info(f"Background job scheduler started: {', '.join(self.jobs) or 'no jobs'}.")
+
+    def stop(self):
+        self._stopped.set()
+
+    # --- Reporting ---
+    def last_runs(self):
+        """
+        Returns {job name: its most recent JobRun, or None} for every registered job.
+        """
+        latest_ids = db.session.query(func.max(JobRun.id)).filter(JobRun.job_name.in_(self.jobs)).group_by(JobRun.job_name)
+        runs = {run.job_name: run for run in JobRun.query.filter(JobRun.id.in_(latest_ids))}
+        return {name: runs.get(name) for name in self.jobs}
@@ -0,0 +1,303 @@
+# backend/benchmark.py
+
+# Endpoint benchmark harness (`flask bench`, `flask bench-json`).
+# Drives every /api/* route through the Flask test client and reports, per route,
+# p50/p95/p99 latency, SQL statements per request and process peak RSS. Results can be
+# saved as a JSON baseline and later runs compared against it to surface regressions.
+# Write routes create and clean up their own BENCH-* records. Peak RSS needs the Unix-only
+# resource module and is reported as n/a without it (Windows).
+import json
+import statistics
+import sys
+import time
+import uuid
+from datetime import date
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+from extensions import db
+from models import Asset, Category, Location, User
+
+try:
+    import resource
+except ImportError: # Not available on Windows; peak RSS is not reported there
+    resource = None
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+class _StatementCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+def _sample_context():
+    """
+    Picks existing ids and names the read scenarios can target.
+    """
+    asset = db.session.query(Asset.id, Asset.status, Asset.make).order_by(Asset.id).first()
+    category = db.session.query(Category.name).order_by(Category.id).first()
+    location = db.session.query(Location.name).order_by(Location.id).first()
+    user = db.session.query(User.id).order_by(User.id).first()
+    return {
+        'run': uuid.uuid4().hex[:8],
+        'asset_id': asset.id if asset else 1,
+        'status': (asset.status if asset else None) or 'Active',
+        'search': (asset.make if asset else None) or 'Dell',
+        'category_name': category.name if category else 'Laptop',
+        'location_name': location.name if location else 'Main Office',
+        'user_id': user.id if user else None,
+    }
+
+def _asset_payload(ctx, tag, i):
+    return {
+        'asset_code': f"BENCH-{ctx['run']}-{tag}-{i}",
+        'serial_number': f"BENCH-SN-{ctx['run']}-{tag}-{i}",
+        'category_name': ctx['category_name'],
+        'location_name': ctx['location_name'],
+        'capital_date': '2024-01-15',
+        'expiry_date': '2027-01-15',
+        'make': 'Dell',
+        'model': 'Latitude 5440',
+    }
+
+def _create_assets(client, ctx, tag, count):
+    ids = []
+    for i in range(count):
+        response = client.post('/api/assets', json=_asset_payload(ctx, tag, i))
+        ids.append(response.get_json()['id'])
+    return ids
+
+def _create_named(client, ctx, path, tag, count):
+    ids = []
+    for i in range(count):
+        response = client.post(path, json={'name': f"BENCH-{ctx['run']}-{tag}-{i}"})
+        ids.append(response.get_json()['id'])
+    return ids
+
+def _cleanup(ctx):
+    """
+    Removes every BENCH-* record created by this run.
+    """
+    prefix = f"BENCH-{ctx['run']}-%"
+    Asset.query.filter(Asset.asset_code.like(prefix)).delete(synchronize_session=False)
+    Category.query.filter(Category.name.like(prefix)).delete(synchronize_session=False)
+    Location.query.filter(Location.name.like(prefix)).delete(synchronize_session=False)
+    User.query.filter(User.emp_id.like(prefix)).delete(synchronize_session=False)
+    db.session.commit()
+
+# (endpoint, setup, request). setup(client, ctx, n) runs untimed and prepares n fixtures;
+# request(client, ctx, i) issues one request, timed for i < iterations (i == iterations is the warm-up).
+SCENARIOS = (
+    ('test_api', None, lambda c, ctx, i: c.get('/api/test')),
+    ('get_assets', None, lambda c, ctx, i: c.get('/api/assets')),
+    ('get_assets [page]', None, lambda c, ctx, i: c.get('/api/assets', query_string={'limit': 50, 'sort': '-expiry_date'})),
+    ('get_assets [filtered]', None, lambda c, ctx, i: c.get('/api/assets', query_string={
+        'status': ctx['status'], 'category_name': ctx['category_name'], 'limit': 100})),
+    ('get_assets [fields]', None, lambda c, ctx, i: c.get('/api/assets', query_string={
+        'fields': 'id,asset_code,serial_number,asset_type,user_name,warranty_status,expiry_date,status'})),
+    ('get_assets [columnar]', None, lambda c, ctx, i: c.get('/api/assets', query_string={'format': 'columnar'})),
+    ('get_asset', None, lambda c, ctx, i: c.get(f"/api/assets/{ctx['asset_id']}")),
+    ('get_asset_changes',
+     lambda c, ctx, n: ctx.__setitem__('change_cursor', max(0, c.get('/api/assets/changes').get_json()['cursor'] - 1000)),
+     lambda c, ctx, i: c.get('/api/assets/changes', query_string={'since': ctx['change_cursor']})),
+    ('export_assets', None, lambda c, ctx, i: c.get('/api/assets/export', query_string={'status': ctx['status']})),
+    ('search_assets', None, lambda c, ctx, i: c.get('/api/assets/search', query_string={'q': ctx['search']})),
+    ('get_report_summary', None, lambda c, ctx, i: c.get('/api/reports/summary')),
+    ('get_report_trends', None, lambda c, ctx, i: c.get('/api/reports/trends', query_string={'dimension': 'category'})),
+    ('get_warranty_alerts', None, lambda c, ctx, i: c.get('/api/warranty/alerts', query_string={'limit': 500})),
+    ('get_users', None, lambda c, ctx, i: c.get('/api/users')),
+    ('get_categories', None, lambda c, ctx, i: c.get('/api/categories')),
+    ('get_locations', None, lambda c, ctx, i: c.get('/api/locations')),
+    ('get_cache_stats', None, lambda c, ctx, i: c.get('/api/cache/stats')),
+    ('get_jobs', None, lambda c, ctx, i: c.get('/api/jobs')),
+    ('add_asset', None, lambda c, ctx, i: c.post('/api/assets', json=_asset_payload(ctx, 'add', i))),
+    ('update_asset',
+     lambda c, ctx, n: ctx.__setitem__('update_ids', _create_assets(c, ctx, 'upd', 1)),
+     lambda c, ctx, i: c.put(f"/api/assets/{ctx['update_ids'][0]}", json={'status': 'In Repair' if i % 2 else 'Active'})),
+    ('patch_asset',
+     lambda c, ctx, n: ctx.__setitem__('patch_ids', _create_assets(c, ctx, 'pat', 1)),
+     lambda c, ctx, i: c.patch(f"/api/assets/{ctx['patch_ids'][0]}", json={'status': 'In Repair' if i % 2 else 'Active'})),
+    ('delete_asset',
+     lambda c, ctx, n: ctx.__setitem__('delete_ids', _create_assets(c, ctx, 'del', n)),
+     lambda c, ctx, i: c.delete(f"/api/assets/{ctx['delete_ids'][i]}")),
+    ('bulk_update_asset_status',
+     lambda c, ctx, n: ctx.__setitem__('bulk_ids', _create_assets(c, ctx, 'bulk', 50)),
+     lambda c, ctx, i: c.post('/api/assets/bulk_status', json={
+         'ids': ctx['bulk_ids'], 'status': 'Scrapped' if i % 2 else 'Active'})),
+    ('import_assets_bulk', None, lambda c, ctx, i: c.post('/api/assets/import', json=[
+        _asset_payload(ctx, f'imp{i}', row) for row in range(100)])),
+    ('add_category', None, lambda c, ctx, i: c.post('/api/categories', json={'name': f"BENCH-{ctx['run']}-cat-{i}"})),
+    ('update_category',
+     lambda c, ctx, n: ctx.__setitem__('category_ids', _create_named(c, ctx, '/api/categories', 'ucat', 1)),
+     lambda c, ctx, i: c.put(f"/api/categories/{ctx['category_ids'][0]}", json={'name': f"BENCH-{ctx['run']}-ucat-{i}"})),
+    ('delete_category',
+     lambda c, ctx, n: ctx.__setitem__('delete_category_ids', _create_named(c, ctx, '/api/categories', 'dcat', n)),
+     lambda c, ctx, i: c.delete(f"/api/categories/{ctx['delete_category_ids'][i]}")),
+    ('add_location', None, lambda c, ctx, i: c.post('/api/locations', json={'name': f"BENCH-{ctx['run']}-loc-{i}"})),
+    ('update_location',
+     lambda c, ctx, n: ctx.__setitem__('location_ids', _create_named(c, ctx, '/api/locations', 'uloc', 1)),
+     lambda c, ctx, i: c.put(f"/api/locations/{ctx['location_ids'][0]}", json={'name': f"BENCH-{ctx['run']}-uloc-{i}"})),
+    ('delete_location',
+     lambda c, ctx, n: ctx.__setitem__('delete_location_ids', _create_named(c, ctx, '/api/locations', 'dloc', n)),
+     lambda c, ctx, i: c.delete(f"/api/locations/{ctx['delete_location_ids'][i]}")),
+    ('add_user', None, lambda c, ctx, i: c.post('/api/users', json={
+        'emp_id': f"BENCH-{ctx['run']}-{i}", 'emp_code': f"BENCH-C-{ctx['run']}-{i}",
+        'name': f"Bench User {i}", 'email': f"bench.{ctx['run']}.{i}@example.com"})),
+    ('update_user',
+     lambda c, ctx, n: ctx.__setitem__('bench_user_id', c.post('/api/users', json={
+         'emp_id': f"BENCH-{ctx['run']}-upd", 'emp_code': f"BENCH-C-{ctx['run']}-upd",
+         'name': 'Bench User', 'email': f"bench.{ctx['run']}.upd@example.com"}).get_json()['id']),
+     lambda c, ctx, i: c.put(f"/api/users/{ctx['bench_user_id']}", json={'designation': f"Level {i}"})),
+)
+
+# Long-lived streams have no meaningful per-request latency
+UNBENCHMARKED_ENDPOINTS = frozenset({'stream_asset_events'})
+
+def run_benchmarks(app, iterations=20, only=None, log=print):
+    """
+    Runs every scenario (or those whose name contains one of `only`) `iterations` times and
+    returns {scenario: stats}. Also warns about /api routes no scenario covers.
+    """
+    client = app.test_client()
+    covered = {name.split(' ')[0] for name, _, _ in SCENARIOS}
+    for rule in app.url_map.iter_rules():
+        if rule.rule.startswith('/api/') and rule.endpoint not in covered | UNBENCHMARKED_ENDPOINTS:
+            log(f"warning: no benchmark scenario for {rule.endpoint} ({rule.rule})")
+
+    results = {}
+    with app.app_context():
+        ctx = _sample_context()
+        try:
+            for name, setup, issue in SCENARIOS:
+                if only and not any(fragment in name for fragment in only):
+                    continue
+                if setup:
+                    setup(client, ctx, iterations + 1)
+                warmup = issue(client, ctx, iterations) # Warm-up on its own fixture, not measured
+                warmup.close()
+                latencies, statements, statuses, sizes = [], [], {}, []
+                for i in range(iterations):
+                    with _StatementCounter(db.engine) as counter:
+                        started = time.perf_counter()
+                        response = issue(client, ctx, i)
+                        body = response.get_data()
+                        latencies.append((time.perf_counter() - started) * 1000)
+                    statements.append(counter.count)
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                    sizes.append(len(body))
+                results[name] = {
+                    'p50_ms': round(_percentile(latencies, 50), 3),
+                    'p95_ms': round(_percentile(latencies, 95), 3),
+                    'p99_ms': round(_percentile(latencies, 99), 3),
+                    'queries_per_request': round(statistics.mean(statements), 2),
+                    'max_queries': max(statements),
+                    'response_bytes': round(statistics.mean(sizes)),
+                    'statuses': {str(code): count for code, count in sorted(statuses.items())},
+                    'warmup_status': warmup.status_code, # The first write to a fresh table lands here
+                    'peak_rss_mb': _peak_rss_mb(),
+                }
+                log(_format_row(name, results[name]))
+        finally:
+            db.session.rollback()
+            _cleanup(ctx)
+    return results
+
+def _format_row(name, stats):
+    return (f"{name:<28} p50 {stats['p50_ms']:>9.2f}ms  p95 {stats['p95_ms']:>9.2f}ms  "
+            f"p99 {stats['p99_ms']:>9.2f}ms  q/req {stats['queries_per_request']:>6.1f}  "
+            f"rss {_format_rss(stats['peak_rss_mb']):>9}  {stats['statuses']}")
+
+def _format_rss(peak_rss_mb):
+    return 'n/a' if peak_rss_mb is None else f"{peak_rss_mb:.1f}MB"
+
+def save_baseline(results, path, metadata):
+    with open(path, 'w') as handle:
+        json.dump({'metadata': metadata, 'results': results}, handle, indent=2, sort_keys=True)
+
+def compare_to_baseline(results, path, tolerance=0.25, log=print):
+    """
+    Compares p95 latency and queries per request with a saved baseline. A scenario regresses
+    when p95 grows by more than `tolerance` (fraction) or it issues more queries per request.
+    Returns the list of regressed scenario names.
+    """
+    with open(path) as handle:
+        baseline = json.load(handle)['results']
+    regressions = []
+    for name, stats in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        slower = stats['p95_ms'] > before['p95_ms'] * (1 + tolerance)
+        more_queries = stats['queries_per_request'] > before['queries_per_request']
+        if slower or more_queries:
+            regressions.append(name)
+            log(f"REGRESSION {name}: p95 {before['p95_ms']} -> {stats['p95_ms']} ms, "
+                f"queries/request {before['queries_per_request']} -> {stats['queries_per_request']}")
+    return regressions
+
+def _legacy_asset_dict(row):
+    """
+    The asset dict as built before json_provider.py: every date converted with .isoformat().
+    """
+    data = dict(row._mapping)
+    for key, value in data.items():
+        if isinstance(value, date):
+            data[key] = value.isoformat()
+    return data
+
+def profile_serialization(app, fetch_rows, serialize_row, iterations=10, log=print):
+    """
+    Splits the work behind the full GET /api/assets list into fetching rows and building
+    the JSON response, for the previous path (per-field .isoformat() and Flask's stdlib
+    provider with sorted keys) and for serialize_row() with app.json. Reports p50 times and
+    the share of each total spent serializing. Returns {label: stats}.
+    """
+    legacy_provider = DefaultJSONProvider(app)
+    paths = {
+        'stdlib + isoformat (before)': lambda rows: legacy_provider.response([_legacy_asset_dict(row) for row in rows]),
+        f"{type(app.json).__name__} (after)": lambda rows: app.json.response([serialize_row(row) for row in rows]),
+    }
+    results = {}
+    with app.app_context():
+        fetch_rows() # Warm the page cache before timing
+        for label, encode in paths.items():
+            fetch_times, encode_times = [], []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                rows = fetch_rows()
+                fetched = time.perf_counter()
+                body = encode(rows).get_data()
+                fetch_times.append((fetched - started) * 1000)
+                encode_times.append((time.perf_counter() - fetched) * 1000)
+            fetch_ms, encode_ms = _percentile(fetch_times, 50), _percentile(encode_times, 50)
+            results[label] = {
+                'rows': len(rows),
+                'response_bytes': len(body),
+                'fetch_p50_ms': round(fetch_ms, 3),
+                'serialize_p50_ms': round(encode_ms, 3),
+                'serialize_share': round(encode_ms / (fetch_ms + encode_ms), 3),
+            }
+            log(f"{label:<32} rows {len(rows):>7}  fetch {fetch_ms:>9.2f}ms  serialize {encode_ms:>9.2f}ms  "
+                f"({results[label]['serialize_share']:.0%} of total)  {len(body):>10} bytes")
+    return results
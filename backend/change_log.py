@@ -0,0 +1,160 @@
+# backend/change_log.py
+
+# Append-only change log behind the delta-sync feed (GET /api/assets/changes).
+#
+# Every flush records which asset, user, category and location rows it inserted,
+# updated or deleted; just before the transaction commits, one ChangeLogEntry per row is
+# written in that same transaction, so the log never disagrees with the data. Entry ids
+# are the feed's sequence numbers: a client keeps the last id it has seen and asks for
+# everything after it.
+#
+# Bulk statements (Query.update/delete, insert(Model)) carry no row ids, so they log a
+# 'reset' for the table, telling clients to refetch it. Code that knows the affected ids
+# can log them with record_row_changes() and opt out of the reset by running the
+# statement with execution_options(change_log=False).
+#
+# Callbacks registered with on_rows_committed() receive the committed entries, with
+# their sequence numbers, after each commit (used by the live event stream).
+#
+# On SQLite writers are serialized, so ids are assigned in commit order. Entries are
+# inserted as late as possible (before_commit) to keep the window in which a server
+# database could commit a lower id after a higher one small.
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, insert
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import Asset, Category, ChangeLogEntry, Location, User
+
+TRACKED_MODELS = (Asset, User, Category, Location)
+TRACKED_TABLES = frozenset(model.__tablename__ for model in TRACKED_MODELS)
+
+_PENDING_CHANGES_KEY = 'pending_row_changes'
+_COMMITTING_CHANGES_KEY = 'committing_row_changes'
+_commit_listeners = []
+
+def on_rows_committed(callback):
+    """
+    Registers callback(session, entries) to run after each commit that logged row changes.
+    entries is a list of (sequence, table, row_id, operation) in log order. Usable as a decorator.
+    """
+    _commit_listeners.append(callback)
+    return callback
+
+def record_row_changes(session, table, operation, row_ids):
+    """
+    Logs changes made outside the unit of work (e.g. bulk_insert_mappings or a bulk UPDATE
+    over known ids). operation is 'upsert' or 'delete'.
+    """
+    pending = session.info.setdefault(_PENDING_CHANGES_KEY, {})
+    for row_id in row_ids:
+        pending[(table, row_id)] = operation
+
+def record_table_reset(session, table):
+    """
+    Logs that a table changed in bulk, telling clients to refetch it. Bulk statements do this
+    automatically unless run with execution_options(change_log=False).
+    """
+    session.info.setdefault(_PENDING_CHANGES_KEY, {})[(table, None)] = 'reset'
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_rows(session, flush_context):
+    # session.new/dirty/deleted still describe the flush that just ran; new rows have ids now
+    for obj in session.new:
+        if obj.__table__.name in TRACKED_TABLES:
+            record_row_changes(session, obj.__table__.name, 'upsert', [obj.id])
+    for obj in session.dirty:
+        if obj.__table__.name in TRACKED_TABLES and session.is_modified(obj):
+            record_row_changes(session, obj.__table__.name, 'upsert', [obj.id])
+    for obj in session.deleted:
+        if obj.__table__.name in TRACKED_TABLES:
+            record_row_changes(session, obj.__table__.name, 'delete', [obj.id])
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_statements(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.local_table.name not in TRACKED_TABLES:
+        return
+    if orm_execute_state.execution_options.get('change_log', True):
+        record_table_reset(orm_execute_state.session, mapper.local_table.name)
+
+@event.listens_for(Session, 'before_commit')
+def _write_change_log(session):
+    if session.in_nested_transaction():
+        return # A savepoint is being released; its rows are logged with the outer commit
+    session.flush()
+    pending = session.info.pop(_PENDING_CHANGES_KEY, None)
+    if not pending:
+        return
+    now = datetime.utcnow()
+    log = ChangeLogEntry.__table__
+    # Through the Connection, so the ORM bulk-statement hooks do not see the log itself
+    connection = session.connection()
+    # SQLite can only guarantee RETURNING order one row per statement. Its AUTOINCREMENT ids
+    # follow VALUES order, so one multi-row INSERT with the ids sorted afterwards is equivalent.
+    ordered = connection.dialect.name != 'sqlite'
+    result = connection.execute(
+        insert(log).returning(log.c.id, sort_by_parameter_order=ordered),
+        [{'table_name': table, 'row_id': row_id, 'operation': operation, 'changed_at': now}
+         for (table, row_id), operation in pending.items()],
+    )
+    sequences = result.scalars().all() if ordered else sorted(result.scalars())
+    if _commit_listeners:
+        session.info[_COMMITTING_CHANGES_KEY] = [
+            (sequence, table, row_id, operation)
+            for sequence, ((table, row_id), operation) in zip(sequences, pending.items())
+        ]
+
+@event.listens_for(Session, 'after_commit')
+def _notify_commit_listeners(session):
+    if session.in_nested_transaction():
+        return # Savepoint release: nothing is committed yet
+    entries = session.info.pop(_COMMITTING_CHANGES_KEY, None)
+    if entries:
+        for callback in _commit_listeners:
+            callback(session, entries)
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_changes(session, previous_transaction):
+    if previous_transaction.parent is not None:
+        return # Savepoint rollback: keep the outer transaction's changes
+    session.info.pop(_PENDING_CHANGES_KEY, None)
+    session.info.pop(_COMMITTING_CHANGES_KEY, None)
+
+def current_sequence():
+    """
+    Returns the id of the newest log entry (0 when the log is empty).
+    """
+    return db.session.query(func.max(ChangeLogEntry.id)).scalar() or 0
+
+def read_changes(since, limit, tables=TRACKED_TABLES):
+    """
+    Returns (entries, has_more, expired) for log entries after sequence `since`, oldest
+    first, at most `limit` of them. expired is True when entries after `since` have
+    already been pruned (or `since` is ahead of the log), so the client must resync.
+    """
+    oldest, newest = db.session.query(func.min(ChangeLogEntry.id), func.max(ChangeLogEntry.id)).one()
+    expired = oldest is not None and (since + 1 < oldest or since > newest)
+    entries = (
+        db.session.query(ChangeLogEntry.id, ChangeLogEntry.table_name, ChangeLogEntry.row_id, ChangeLogEntry.operation)
+        .filter(ChangeLogEntry.id > since, ChangeLogEntry.table_name.in_(tables))
+        .order_by(ChangeLogEntry.id)
+        .limit(limit + 1)
+        .all()
+    )
+    return entries[:limit], len(entries) > limit, expired
+
+def prune_change_log(older_than_days):
+    """
+    Deletes entries older than the given number of days. Returns the number removed.
+    The newest entry is always kept so read_changes() can still tell which cursors expired.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    removed = db.session.query(ChangeLogEntry).filter(
+        ChangeLogEntry.changed_at < cutoff, ChangeLogEntry.id < current_sequence()
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return removed
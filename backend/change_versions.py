@@ -0,0 +1,147 @@
+# backend/change_versions.py
+
+# Per-table change versions. Session events record which tables a transaction writes,
+# and the matching TableVersion rows are incremented just before it commits, so the
+# counters are shared by every worker process using the same database.
+# The list endpoints turn those counters into ETags and answer If-None-Match with 304,
+# and callbacks registered with on_tables_committed() hear about every committed write.
+from datetime import date
+from functools import wraps
+
+from flask import g, make_response, request
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import TableVersion
+
+_CHANGED_TABLES_KEY = 'changed_tables'
+_COMMITTING_TABLES_KEY = 'committing_tables'
+_commit_listeners = []
+
+def on_tables_committed(callback):
+    """
+    Registers callback(tables) to run after each commit that wrote to any table.
+    Usable as a decorator.
+    """
+    _commit_listeners.append(callback)
+    return callback
+
+def mark_tables_changed(session, *tables):
+    """
+    Records tables written outside the unit of work (e.g. bulk_insert_mappings), which
+    the flush events cannot see.
+    """
+    session.info.setdefault(_CHANGED_TABLES_KEY, set()).update(
+        table for table in tables if table != TableVersion.__tablename__)
+
+@event.listens_for(Session, 'before_flush')
+def _collect_flushed_tables(session, flush_context, instances):
+    changed = [obj for obj in session.new | session.deleted]
+    changed += [obj for obj in session.dirty if session.is_modified(obj)]
+    mark_tables_changed(session, *{obj.__table__.name for obj in changed})
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_statement_tables(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert) \
+            and orm_execute_state.bind_mapper is not None:
+        mark_tables_changed(orm_execute_state.session, orm_execute_state.bind_mapper.local_table.name)
+
+@event.listens_for(Session, 'before_commit')
+def _bump_table_versions(session):
+    if session.in_nested_transaction():
+        return # A savepoint is being released; its tables are bumped with the outer commit
+    session.flush() # Collect tables from the final flush before they are committed
+    tables = session.info.pop(_CHANGED_TABLES_KEY, None)
+    if tables:
+        session.info[_COMMITTING_TABLES_KEY] = tables
+    for table in sorted(tables or ()):
+        result = session.execute(
+            update(TableVersion)
+            .where(TableVersion.table_name == table)
+            .values(version=TableVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            session.add(TableVersion(table_name=table, version=1))
+
+@event.listens_for(Session, 'after_commit')
+def _notify_commit_listeners(session):
+    if session.in_nested_transaction():
+        return # Savepoint release: nothing is committed yet
+    tables = session.info.pop(_COMMITTING_TABLES_KEY, None)
+    if tables:
+        for callback in _commit_listeners:
+            callback(frozenset(tables))
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_changed_tables(session, previous_transaction):
+    if previous_transaction.parent is not None:
+        return # A savepoint rolled back; the outer transaction's writes still stand
+    session.info.pop(_CHANGED_TABLES_KEY, None)
+    session.info.pop(_COMMITTING_TABLES_KEY, None)
+
+def seed_table_versions():
+    """
+    Adds a version 0 row for every table that has none, so that the first write to a table
+    bumps it with a single UPDATE. Migrations seed these rows; call this after db.create_all().
+    """
+    existing = {name for (name,) in db.session.query(TableVersion.table_name)}
+    db.session.add_all(TableVersion(table_name=name, version=0) for name in sorted(db.metadata.tables)
+                       if name != TableVersion.__tablename__ and name not in existing)
+    db.session.commit()
+
+def get_table_versions(*tables):
+    """
+    Returns {table: version} for the given tables; tables never written report 0.
+    """
+    rows = db.session.query(TableVersion.table_name, TableVersion.version).filter(
+        TableVersion.table_name.in_(tables))
+    versions = dict.fromkeys(tables, 0)
+    versions.update(rows)
+    return versions
+
+def version_tag(*tables, daily=False):
+    """
+    Returns a string identifying the current versions of the given tables (plus today's
+    date when daily=True), e.g. 'asset.12-user.3'. Memoized for the rest of the request so
+    stacked decorators share one lookup.
+    """
+    memo = g.setdefault('_version_tags', {})
+    key = (tables, daily)
+    if key not in memo:
+        memo[key] = format_version_tag(tables, get_table_versions(*tables), daily)
+    return memo[key]
+
+def format_version_tag(tables, versions, daily=False):
+    """
+    Builds the tag version_tag() returns from a {table: version} map.
+    """
+    tag = '-'.join(f"{table}.{versions.get(table, 0)}" for table in tables)
+    if daily:
+        tag += f"-{date.today().isoformat()}"
+    return tag
+
+def etag_from_versions(*tables, daily=False, vary=()):
+    """
+    Decorator for GET views whose response depends only on the given tables (and, with
+    daily=True, on today's date, for date-relative filters such as warranty expiry).
+    Sets a weak ETag on 200 responses and returns 304 Not Modified when the client's
+    If-None-Match already holds the current one. The view still runs on a mismatch.
+    vary names request headers that select between representations (e.g. Accept); they
+    are sent as Vary on every response, 304s included, so HTTP caches keep them apart.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            tag = version_tag(*tables, daily=daily)
+            if request.if_none_match.contains_weak(tag):
+                response = make_response('', 304)
+                response.set_etag(tag, weak=True)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    response.set_etag(tag, weak=True)
+            response.vary.update(vary)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,112 @@
+# backend/db_config.py
+
+# Database engine configuration read from the environment.
+#
+#   DATABASE_URL            SQLAlchemy URL (default: sqlite:///asset_management.db in the instance folder)
+#
+# SQLite tuning, applied to every new connection (set SQLITE_TUNING=off to keep SQLite defaults):
+#   SQLITE_JOURNAL_MODE     default WAL     - readers no longer block on a writer
+#   SQLITE_SYNCHRONOUS      default NORMAL  - with WAL, fsync at checkpoints instead of every commit
+#   SQLITE_BUSY_TIMEOUT_MS  default 5000    - wait for a lock instead of failing with "database is locked"
+#   SQLITE_MMAP_SIZE        default 268435456 (256 MB) of memory-mapped reads
+#   SQLITE_CACHE_SIZE       default -65536  (negative = KiB, i.e. a 64 MB page cache)
+#
+# Server databases (PostgreSQL, MySQL, ...):
+#   DB_POOL_SIZE            default 10
+#   DB_MAX_OVERFLOW         default 20
+#   DB_POOL_TIMEOUT         default 30 seconds
+#   DB_POOL_RECYCLE         default 1800 seconds
+#   DB_POOL_PRE_PING        default on
+#
+# Async serving (asgi.py):
+#   ASYNC_DATABASE_URL      async driver URL; by default derived from the sync URL
+#                           (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg,
+#                           mysql -> mysql+aiomysql)
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+DEFAULT_DATABASE_URL = 'sqlite:///asset_management.db'
+
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+SQLITE_PRAGMA_DEFAULTS = {
+    'journal_mode': ('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': ('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': ('SQLITE_BUSY_TIMEOUT_MS', '5000'),
+    'mmap_size': ('SQLITE_MMAP_SIZE', '268435456'),
+    'cache_size': ('SQLITE_CACHE_SIZE', '-65536'),
+}
+
+def _env_flag(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ('0', 'false', 'no', 'off')
+
+def sqlite_pragmas():
+    """
+    Returns the PRAGMA name -> value map to apply on each SQLite connection,
+    or an empty dict when SQLITE_TUNING is switched off.
+    """
+    if not _env_flag('SQLITE_TUNING', True):
+        return {}
+    return {pragma: os.environ.get(env_name, default) for pragma, (env_name, default) in SQLITE_PRAGMA_DEFAULTS.items()}
+
+def configure_database(app):
+    """
+    Sets SQLALCHEMY_DATABASE_URI and SQLALCHEMY_ENGINE_OPTIONS on the app from the environment.
+    Must run before db.init_app(app).
+    """
+    url = os.environ.get('DATABASE_URL', DEFAULT_DATABASE_URL)
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    if make_url(url).get_backend_name() == 'sqlite':
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {}
+    else:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+            'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+            'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+            'pool_pre_ping': _env_flag('DB_POOL_PRE_PING', True),
+        }
+
+def register_sqlite_tuning(engine):
+    """
+    Applies sqlite_pragmas() to every new connection of a SQLite engine. No-op for other backends
+    and for in-memory databases, which cannot use WAL.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas()
+    if not pragmas:
+        return
+    if engine.url.database in (None, '', ':memory:'):
+        pragmas.pop('journal_mode', None)
+
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
+
+def async_database_url(sync_url):
+    """
+    Returns the async-driver URL for the database the sync engine uses (ASYNC_DATABASE_URL
+    wins when set). Pass the sync engine's URL so relative SQLite paths resolve the same way.
+    """
+    if os.environ.get('ASYNC_DATABASE_URL'):
+        return make_url(os.environ['ASYNC_DATABASE_URL'])
+    url = make_url(sync_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}; set ASYNC_DATABASE_URL.")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
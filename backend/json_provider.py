@@ -0,0 +1,87 @@
+# backend/json_provider.py
+
+# JSON encoding for API responses (app.json, used by jsonify).
+#
+# Dates and datetimes are written as ISO 8601 strings ('2025-06-13') by the encoder
+# itself, so serializers hand rows over with their date objects untouched instead of
+# calling .isoformat() per field. With orjson installed (pip install orjson), encoding
+# runs in C and writes bytes straight into the response; without it, the stdlib encoder
+# produces the same output. Select with JSON_PROVIDER=orjson|stdlib (default: orjson
+# when available).
+#
+# Keys are not sorted: no client depends on key order, and ETags and cache keys come
+# from table versions, not from response bodies.
+import json
+from datetime import date
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError: # Optional; the stdlib provider is used instead
+    orjson = None
+
+JSON_PROVIDERS = ('orjson', 'stdlib')
+
+def _default(value):
+    if isinstance(value, date): # Also covers datetime
+        return value.isoformat()
+    return DefaultJSONProvider.default(value)
+
+if orjson is not None:
+    ORJSON_OPTIONS = 0 # Dict keys must be strings; OPT_NON_STR_KEYS would slow every dict down
+
+    def dumps(obj):
+        """
+        Encodes obj to a JSON string, for output built outside app.json (NDJSON lines, SSE data).
+        """
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode()
+else:
+    def dumps(obj):
+        """
+        Encodes obj to a JSON string, for output built outside app.json (NDJSON lines, SSE data).
+        """
+        return json.dumps(obj, default=_default)
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """
+    Flask's default provider, but with ISO 8601 dates and unsorted keys.
+    """
+    default = staticmethod(_default)
+    sort_keys = False
+
+class OrjsonProvider(StdlibJSONProvider):
+    """
+    orjson-backed provider. Calls with stdlib-only keyword arguments (e.g. cls=) fall
+    back to StdlibJSONProvider.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s) # orjson.JSONDecodeError is a ValueError, as Flask expects
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = ORJSON_OPTIONS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(orjson.dumps(obj, default=_default, option=option), mimetype=self.mimetype)
+
+def create_json_provider(app):
+    """
+    Returns the provider named by JSON_PROVIDER for app.json.
+    """
+    name = app.config.get('JSON_PROVIDER') or ('orjson' if orjson is not None else 'stdlib')
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"JSON_PROVIDER must be one of {JSON_PROVIDERS}")
+    if name == 'orjson':
+        if orjson is None:
+            raise ValueError("JSON_PROVIDER=orjson requires the orjson package.")
+        return OrjsonProvider(app)
+    return StdlibJSONProvider(app)
@@ -0,0 +1,88 @@
+# backend/lookup_cache.py
+
+# Small process-local LRU caches used to resolve Category and Location names to ids
+# on the asset write path without querying those (tiny, rarely changing) tables.
+# Names created inside a transaction are only cached once it commits (put_after_commit),
+# so a rolled-back insert never leaves an id behind that points at no row.
+from collections import OrderedDict
+from threading import Lock
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_PENDING_ENTRIES_KEY = 'pending_lookup_entries'
+
+class LookupCache:
+    """
+    Thread-safe, bounded name -> id map with least-recently-used eviction.
+    Keeps hit/miss/eviction counters so the cache's usefulness can be monitored.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, name):
+        """
+        Returns the cached id for name, or None on a miss.
+        """
+        with self._lock:
+            if name in self._entries:
+                self._entries.move_to_end(name)
+                self.hits += 1
+                return self._entries[name]
+            self.misses += 1
+            return None
+
+    def put(self, name, value):
+        with self._lock:
+            self._entries[name] = value
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def put_after_commit(self, session, name, value):
+        """
+        Caches name -> value once the session's current transaction commits; dropped on rollback.
+        """
+        session.info.setdefault(_PENDING_ENTRIES_KEY, []).append((self, name, value))
+
+    def invalidate(self, *names):
+        """
+        Drops the given names. With no arguments the whole cache is cleared.
+        """
+        with self._lock:
+            if not names:
+                self._entries.clear()
+            for name in names:
+                self._entries.pop(name, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+@event.listens_for(Session, 'after_commit')
+def _apply_pending_entries(session):
+    if session.in_nested_transaction():
+        return # Savepoint release: the names are not committed yet
+    for cache, name, value in session.info.pop(_PENDING_ENTRIES_KEY, ()):
+        cache.put(name, value)
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_entries(session, previous_transaction):
+    if previous_transaction.parent is not None:
+        return # Savepoint rollback: the outer transaction may still commit its names
+    session.info.pop(_PENDING_ENTRIES_KEY, None)
@@ -0,0 +1,72 @@
+"""Add SQLite FTS5 search index over assets
+
+Revision ID: 7b3d5f9e2c41
+Revises: 5a7c9e1d3f28
+Create Date: 2026-10-18 14:21:09.530117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3d5f9e2c41'
+down_revision = '5a7c9e1d3f28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other databases fall back to LIKE search in the API.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("""
+        CREATE VIRTUAL TABLE asset_fts USING fts5(
+            asset_code, serial_number, asset_description, make, model, user_name,
+            tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER asset_fts_ai AFTER INSERT ON asset BEGIN
+            INSERT INTO asset_fts (rowid, asset_code, serial_number, asset_description, make, model, user_name)
+            VALUES (new.id, new.asset_code, new.serial_number, new.asset_description, new.make, new.model,
+                    (SELECT name FROM "user" WHERE id = new.user_id));
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER asset_fts_au
+        AFTER UPDATE OF asset_code, serial_number, asset_description, make, model, user_id ON asset BEGIN
+            DELETE FROM asset_fts WHERE rowid = old.id;
+            INSERT INTO asset_fts (rowid, asset_code, serial_number, asset_description, make, model, user_name)
+            VALUES (new.id, new.asset_code, new.serial_number, new.asset_description, new.make, new.model,
+                    (SELECT name FROM "user" WHERE id = new.user_id));
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER asset_fts_ad AFTER DELETE ON asset BEGIN
+            DELETE FROM asset_fts WHERE rowid = old.id;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER user_fts_au AFTER UPDATE OF name ON "user" BEGIN
+            UPDATE asset_fts SET user_name = new.name WHERE rowid IN (SELECT id FROM asset WHERE user_id = new.id);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER user_fts_ad AFTER DELETE ON "user" BEGIN
+            UPDATE asset_fts SET user_name = NULL WHERE rowid IN (SELECT id FROM asset WHERE user_id = old.id);
+        END
+    """)
+    op.execute("""
+        INSERT INTO asset_fts (rowid, asset_code, serial_number, asset_description, make, model, user_name)
+        SELECT asset.id, asset.asset_code, asset.serial_number, asset.asset_description, asset.make, asset.model, "user".name
+        FROM asset LEFT OUTER JOIN "user" ON "user".id = asset.user_id
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for trigger in ('user_fts_ad', 'user_fts_au', 'asset_fts_ad', 'asset_fts_au', 'asset_fts_ai'):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS asset_fts")
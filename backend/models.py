@@ -54,16 +54,84 @@ class Asset(db.Model):
     make = db.Column(db.String(100))
     model = db.Column(db.String(100))
     status = db.Column(db.String(50), default='Active') # e.g., Active, In Repair, Scrapped, Disposed
-    department = db.Column(db.String(100))
-    division = db.Column(db.String(100))
-    plant_code = db.Column(db.String(50))
-    warranty_status = db.Column(db.String(50), default='In Warranty') # e.g., In Warranty, Expired
-    expiry_date = db.Column(db.Date)
+    department = db.Column(db.String(100), index=True)
+    division = db.Column(db.String(100), index=True)
+    plant_code = db.Column(db.String(50), index=True)
+    warranty_status = db.Column(db.String(50), default='In Warranty', index=True) # e.g., In Warranty, Expired
+    expiry_date = db.Column(db.Date, index=True) # Indexed for warranty expiry window queries
 
     # Foreign Keys
-    category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=False)
-    location_id = db.Column(db.Integer, db.ForeignKey('location.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True) # Nullable if unassigned
+    category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=False, index=True)
+    location_id = db.Column(db.Integer, db.ForeignKey('location.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True, index=True) # Nullable if unassigned
+
+    # Status filters usually come with a category (Assets/Reports pages); the composite
+    # index also serves status-only lookups through its leading column.
+    __table_args__ = (
+        db.Index('ix_asset_status_category_id', 'status', 'category_id'),
+    )
 
     def __repr__(self):
         return f"<Asset {self.asset_code}>"
+
+class TableVersion(db.Model):
+    # Change counter per table, bumped in the same transaction as every commit that
+    # writes to that table. Used to build ETags for the list endpoints.
+    table_name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersion {self.table_name}={self.version}>"
+
+class ChangeLogEntry(db.Model):
+    # Append-only log of committed row changes, read by the delta-sync feed
+    # (GET /api/assets/changes). id is the feed sequence number; AUTOINCREMENT keeps it
+    # from ever being reused on SQLite, even after old entries are pruned.
+    __tablename__ = 'change_log'
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.Integer) # None for a 'reset' of the whole table
+    operation = db.Column(db.String(10), nullable=False) # upsert, delete or reset
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<ChangeLogEntry {self.id} {self.operation} {self.table_name}:{self.row_id}>"
+
+class JobRun(db.Model):
+    # One row per background job run (see background_jobs.py): when it started, how long
+    # it took and what it changed, so slow or failing runs can be spotted.
+    __tablename__ = 'job_run'
+    __table_args__ = (
+        db.Index('ix_job_run_job_name_started_at', 'job_name', 'started_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(100), nullable=False)
+    started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    duration_ms = db.Column(db.Float, nullable=False)
+    succeeded = db.Column(db.Boolean, nullable=False)
+    rows_affected = db.Column(db.Integer)
+    error = db.Column(db.Text)
+
+    def __repr__(self):
+        return f"<JobRun {self.job_name} {self.started_at} {'ok' if self.succeeded else 'failed'}>"
+
+class AssetSummarySnapshot(db.Model):
+    # Asset counts per dimension value for one day (see asset_snapshots.py), e.g.
+    # (2026-10-18, 'status', 'Active', 1520). Trend reports read these pre-aggregated
+    # rows instead of rescanning the asset table.
+    __tablename__ = 'asset_summary_snapshot'
+    __table_args__ = (
+        db.UniqueConstraint('dimension', 'snapshot_date', 'name', name='uq_asset_summary_snapshot'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    snapshot_date = db.Column(db.Date, nullable=False)
+    dimension = db.Column(db.String(20), nullable=False) # total, status, category, location, department, warranty, assignment
+    name = db.Column(db.String(100)) # None counts assets with no value for the dimension
+    asset_count = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<AssetSummarySnapshot {self.snapshot_date} {self.dimension}:{self.name}={self.asset_count}>"
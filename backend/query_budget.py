@@ -0,0 +1,134 @@
+# backend/query_budget.py
+
+# Opt-in guard against query-count regressions and N+1 patterns.
+#
+# Views declare how many SQL statements a request may issue with @query_budget(n).
+# When QUERY_BUDGET_MODE is 'log' or 'raise', every statement executed during a request
+# is counted through engine cursor events, and statements are grouped by shape (the
+# parameterized SQL with IN-lists collapsed). A request violates the guard when it
+#   - issues more statements than its view's budget, or
+#   - repeats one statement shape QUERY_BUDGET_REPEAT_THRESHOLD times or more, the
+#     signature of a lazy relationship loaded once per row.
+# 'log' writes a warning with the offending shapes (for development); 'raise' raises
+# QueryBudgetExceeded so the request fails (for test runs). 'off' (the default) skips
+# all bookkeeping.
+#
+# Views that work in batches (the bulk import) declare a fixed budget plus a per-batch
+# allowance with @query_budget(n, per_batch=m) and report each batch with
+# count_query_batch(). Each batch also raises the repeat threshold by m, which leaves
+# room for statements issued once per batch but still flags one issued once per row.
+#
+# Streamed responses keep querying after the view returns, so they are checked on
+# teardown and can only be logged.
+import re
+from collections import Counter
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+QUERY_BUDGET_MODES = ('off', 'log', 'raise')
+
+_IN_LIST_PATTERN = re.compile(r'\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))+\s*\)')
+_NUMBER_PATTERN = re.compile(r'\b\d+\b')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+def query_budget(max_queries, max_repeats=None, per_batch=None):
+    """
+    View decorator declaring the most SQL statements one request to the view may issue
+    (None: no total limit). max_repeats overrides the app-wide repeat threshold for views
+    that legitimately run one statement shape a few times. per_batch adds that many
+    statements, and as many repeats of one shape, for every count_query_batch() call.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            return view(*args, **kwargs)
+        wrapper.query_budget = max_queries
+        wrapper.query_repeat_budget = max_repeats
+        wrapper.query_batch_budget = per_batch
+        return wrapper
+    return decorator
+
+def count_query_batch():
+    """
+    Tells the guard the current request has started one more batch (see per_batch above).
+    """
+    if has_request_context() and g.get('_query_budget') is not None:
+        g._query_batches = g.get('_query_batches', 0) + 1
+
+def statement_shape(statement):
+    """
+    Normalizes SQL so statements differing only in bound values or IN-list length compare equal.
+    """
+    shape = _IN_LIST_PATTERN.sub('(?)', statement)
+    shape = _NUMBER_PATTERN.sub('N', shape)
+    return _WHITESPACE_PATTERN.sub(' ', shape).strip()
+
+class QueryBudgetGuard:
+    """
+    Counts statements per request and enforces the budgets declared with @query_budget.
+    Call init_app(app, engine) once.
+    """
+
+    def init_app(self, app, engine):
+        app.config.setdefault('QUERY_BUDGET_MODE', 'off')
+        app.config.setdefault('QUERY_BUDGET_REPEAT_THRESHOLD', 5)
+        if app.config['QUERY_BUDGET_MODE'] not in QUERY_BUDGET_MODES:
+            raise ValueError(f"QUERY_BUDGET_MODE must be one of {QUERY_BUDGET_MODES}")
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+
+    def _before_request(self):
+        if current_app.config['QUERY_BUDGET_MODE'] != 'off':
+            g._query_budget = Counter()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            shapes = g.get('_query_budget')
+            if shapes is not None:
+                shapes[statement_shape(statement)] += 1
+
+    def _after_request(self, response):
+        if not response.is_streamed:
+            shapes = g.pop('_query_budget', None)
+            if shapes is not None:
+                self._check(shapes, g.pop('_query_batches', 0), can_raise=True)
+        return response
+
+    def _teardown_request(self, exc):
+        shapes = g.pop('_query_budget', None)
+        if shapes is not None and exc is None:
+            self._check(shapes, g.pop('_query_batches', 0), can_raise=False)
+
+    def _check(self, shapes, batches, can_raise):
+        view = current_app.view_functions.get(request.endpoint)
+        budget = getattr(view, 'query_budget', None)
+        repeat_budget = getattr(view, 'query_repeat_budget', None)
+        if repeat_budget is None:
+            repeat_budget = current_app.config['QUERY_BUDGET_REPEAT_THRESHOLD'] - 1
+        batch_budget = getattr(view, 'query_batch_budget', None)
+        if batch_budget is not None:
+            budget = None if budget is None else budget + batch_budget * batches
+            repeat_budget += batch_budget * batches
+
+        problems = []
+        total = sum(shapes.values())
+        if budget is not None and total > budget:
+            problems.append(f"{total} statements (budget {budget})")
+        for shape, count in shapes.most_common():
+            if count <= repeat_budget:
+                break
+            problems.append(f"possible N+1: {count}x {shape[:200]}")
+        if not problems:
+            return
+
+        message = f"Query budget exceeded for {request.method} {request.path} ({request.endpoint}): " + '; '.join(problems)
+        if can_raise and current_app.config['QUERY_BUDGET_MODE'] == 'raise':
+            raise QueryBudgetExceeded(message)
+        current_app.logger.warning(message)
@@ -0,0 +1,30 @@
+# backend/query_plans.py
+
+# EXPLAIN QUERY PLAN helpers used by the `flask check-query-plans` command to catch
+# hot asset queries that regress to full table scans (e.g. after an index is dropped).
+import re
+
+from extensions import db
+
+# Matches SQLite plan lines that read a whole table, e.g. "SCAN asset" or "SCAN TABLE asset".
+# "SCAN asset USING INDEX ..." is an ordered index walk and is not flagged.
+FULL_SCAN_PATTERN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+
+def explain_query_plan(query):
+    """
+    Runs EXPLAIN QUERY PLAN for a SQLAlchemy query on SQLite and returns the plan detail lines.
+    """
+    statement = query.statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {statement}")).all()
+    return [row[-1] for row in rows]
+
+def find_full_scans(plan, tables):
+    """
+    Returns the plan lines that scan one of the given tables without using an index.
+    """
+    scans = []
+    for detail in plan:
+        match = FULL_SCAN_PATTERN.match(detail.strip())
+        if match and match.group(1) in tables:
+            scans.append(detail)
+    return scans
@@ -0,0 +1,167 @@
+# backend/request_metrics.py
+
+# Per-route request instrumentation exposed in Prometheus text format (GET /metrics).
+#
+# Request hooks time every request and record, per Flask endpoint and method:
+#   http_requests_total                   counter by status code
+#   http_request_duration_seconds         latency histogram
+#   http_request_sql_queries              SQL statements issued per request
+#   http_request_sql_duration_seconds     time spent in SQL per request
+#   http_response_size_bytes              body size (not known for streamed responses)
+# SQL statements are counted with engine cursor events and attributed to the request
+# running on the same thread. Streamed responses (e.g. NDJSON exports) are finalized
+# when the request context is torn down, so their latency and SQL figures include the
+# time spent generating the body.
+#
+# Counters are per process; with several workers, scrape each one (or let Prometheus
+# sum them). Endpoints are labelled by Flask endpoint name, never by raw path, so ids
+# in URLs cannot blow up label cardinality.
+import time
+from bisect import bisect_left
+from threading import Lock
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+UNMATCHED_ENDPOINT = 'unmatched' # 404s and other requests that did not resolve to a route
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+class _Histogram:
+    """
+    Cumulative-bucket histogram as Prometheus expects it: one count per upper bound plus +Inf.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else _format_number(bound)
+            yield f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}"
+        yield f"{name}_sum{_format_labels(labels)} {_format_number(self.sum)}"
+        yield f"{name}_count{_format_labels(labels)} {cumulative}"
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        f'{name}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+# name -> (type, help, buckets or None for counters)
+METRIC_DEFINITIONS = {
+    'http_requests_total': ('counter', 'Requests served, by endpoint, method and status code.', None),
+    'http_request_duration_seconds': ('histogram', 'Request latency in seconds.', LATENCY_BUCKETS),
+    'http_request_sql_queries': ('histogram', 'SQL statements executed per request.', SQL_QUERY_BUCKETS),
+    'http_request_sql_duration_seconds': ('histogram', 'Time spent executing SQL per request, in seconds.', LATENCY_BUCKETS),
+    'http_response_size_bytes': ('histogram', 'Response body size in bytes (buffered responses only).', SIZE_BUCKETS),
+}
+
+class RequestMetrics:
+    """
+    Collects per-endpoint request metrics. Call init_app(app, engine) once, then serve
+    render() from the metrics route.
+    """
+
+    def __init__(self, excluded_endpoints=('metrics', 'static')):
+        self.excluded_endpoints = frozenset(excluded_endpoints)
+        self._lock = Lock()
+        self._series = {name: {} for name in METRIC_DEFINITIONS} # name -> {labels: value or _Histogram}
+
+    def init_app(self, app, engine):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    # --- Request hooks ---
+    def _before_request(self):
+        if request.endpoint in self.excluded_endpoints:
+            return
+        g._metrics = {'started': time.perf_counter(), 'queries': 0, 'sql_seconds': 0.0,
+                      'status': 500, 'bytes': None}
+
+    def _after_request(self, response):
+        state = g.get('_metrics')
+        if state is not None:
+            state['status'] = response.status_code
+            state['bytes'] = None if response.is_streamed else response.calculate_content_length()
+        return response
+
+    def _teardown_request(self, exc):
+        state = g.pop('_metrics', None)
+        if state is None:
+            return
+        labels = (('endpoint', request.endpoint or UNMATCHED_ENDPOINT), ('method', request.method))
+        with self._lock:
+            self._increment('http_requests_total', labels + (('status', str(state['status'])),))
+            self._observe('http_request_duration_seconds', labels, time.perf_counter() - state['started'])
+            self._observe('http_request_sql_queries', labels, state['queries'])
+            self._observe('http_request_sql_duration_seconds', labels, state['sql_seconds'])
+            if state['bytes'] is not None:
+                self._observe('http_response_size_bytes', labels, state['bytes'])
+
+    # --- Engine events ---
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not has_request_context():
+            return
+        state = g.get('_metrics')
+        if state is None:
+            return
+        state['queries'] += 1
+        started = getattr(context, '_metrics_started', None)
+        if started is not None:
+            state['sql_seconds'] += time.perf_counter() - started
+
+    # --- Storage ---
+    def _increment(self, name, labels):
+        series = self._series[name]
+        series[labels] = series.get(labels, 0) + 1
+
+    def _observe(self, name, labels, value):
+        series = self._series[name]
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = _Histogram(METRIC_DEFINITIONS[name][2])
+        histogram.observe(value)
+
+    def render(self):
+        """
+        Returns all metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            for name, (kind, help_text, _) in METRIC_DEFINITIONS.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(self._series[name].items()):
+                    if kind == 'histogram':
+                        lines.extend(value.lines(name, labels))
+                    else:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def response(self):
+        return Response(self.render(), content_type=PROMETHEUS_CONTENT_TYPE)
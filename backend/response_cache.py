@@ -0,0 +1,267 @@
+# backend/response_cache.py
+
+# Response cache for the read-heavy list endpoints.
+#
+# Entries are keyed by route, normalized query string and the current change versions of
+# the tables the route reads (see change_versions.py), so a write committed by any worker
+# makes older entries unreachable. Writes also invalidate entries tagged with the tables
+# they touched, which frees memory right away instead of waiting for TTL/LRU eviction.
+#
+# Backends:
+#   MemoryCacheBackend  per-process LRU bounded by entry count and total bytes, with TTL
+#   SQLiteCacheBackend  a local SQLite file shared by every worker process on the host,
+#                       bounded by entry count and total bytes, with TTL
+import os
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from urllib.parse import urlencode
+
+from flask import Response, request
+
+from change_versions import version_tag
+
+class MemoryCacheBackend:
+    """
+    Thread-safe in-process LRU cache with per-entry TTL and a total byte budget.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict() # key -> (expires_at, tags, size, value)
+        self._bytes = 0
+        self._lock = Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[3]
+
+    def set(self, key, value, size, ttl, tags):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, frozenset(tags), size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[1] & tags]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[2]
+
+class SQLiteCacheBackend:
+    """
+    Cache stored in a local SQLite file so several worker processes on one host share entries.
+    A connection is opened per operation, which keeps the backend safe across threads and forks.
+    """
+
+    def __init__(self, path, max_entries=256, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                " key TEXT PRIMARY KEY, tags TEXT NOT NULL, expires_at REAL NOT NULL,"
+                " size INTEGER NOT NULL, value BLOB NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, key):
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT value FROM response_cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, key, value, size, ttl, tags):
+        if size > self.max_bytes:
+            return
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO response_cache (key, tags, expires_at, size, value) VALUES (?, ?, ?, ?, ?)",
+                (key, ',' + ','.join(sorted(tags)) + ',', time.time() + ttl, size, pickle.dumps(value)),
+            )
+            connection.execute("DELETE FROM response_cache WHERE expires_at < ?", (time.time(),))
+            # Over the entry limit, drop the entries closest to expiry (the oldest, for one TTL)
+            connection.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                " SELECT key FROM response_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+            )
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()[0]
+            if total > self.max_bytes:
+                # Drop the entries closest to expiry until the budget fits again
+                connection.execute(
+                    "DELETE FROM response_cache WHERE key IN ("
+                    " SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY expires_at DESC) AS running"
+                    " FROM response_cache) WHERE running > ?)", (self.max_bytes,)
+                )
+
+    def invalidate_tags(self, tags):
+        with self._connect() as connection:
+            for tag in tags:
+                connection.execute("DELETE FROM response_cache WHERE tags LIKE ?", (f'%,{tag},%',))
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM response_cache")
+
+    def stats(self):
+        with self._connect() as connection:
+            entries, size = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response_cache").fetchone()
+        return {'backend': 'sqlite', 'path': self.path, 'entries': entries, 'bytes': size,
+                'max_entries': self.max_entries, 'max_bytes': self.max_bytes}
+
+class ResponseCache:
+    """
+    Caches complete 200 responses of GET views. Use cache.cached(*tables) as a view decorator
+    and call cache.invalidate_tables(tables) after writes.
+    """
+
+    def __init__(self, backend=None, default_ttl=30):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def make_key(tables, daily, vary):
+        """
+        Route + normalized query string (sorted, repeated values kept) + varied headers +
+        the current table version tag.
+        """
+        return ResponseCache.build_key(
+            request.path, request.args.items(multi=True),
+            [request.headers.get(header, '') for header in vary], version_tag(*tables, daily=daily))
+
+    @staticmethod
+    def build_key(path, query_items, varied_values, tag):
+        """
+        The key format behind make_key(), for callers outside a Flask request (asgi.py),
+        so both serving modes share entries.
+        """
+        return f"{path}?{urlencode(sorted(query_items))}|{'|'.join(varied_values)}|{tag}"
+
+    def cached(self, *tables, ttl=None, daily=False, vary=()):
+        """
+        View decorator. tables lists what the response reads (used for the key and for
+        invalidation); daily=True adds today's date for date-relative results; vary names
+        request headers that change the response (e.g. Accept). Streamed responses are
+        never cached.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.backend is None:
+                    return view(*args, **kwargs)
+                key = self.make_key(tables, daily, vary)
+                cached = self.lookup(key)
+                if cached is not None:
+                    body, status, headers = cached
+                    return Response(body, status=status, headers=headers)
+
+                response = view(*args, **kwargs)
+                if isinstance(response, Response) and response.status_code == 200 and not response.is_streamed:
+                    headers = [(name, value) for name, value in response.headers if name.lower() != 'content-length']
+                    self.store(key, response.get_data(), headers, tables, ttl)
+                return response
+            return wrapper
+        return decorator
+
+    def lookup(self, key):
+        """
+        Returns the cached (body, status, headers) for key, or None. Counts the hit or miss.
+        """
+        if self.backend is None:
+            return None
+        cached = self.backend.get(key)
+        self._count('hits' if cached is not None else 'misses')
+        return cached
+
+    def store(self, key, body, headers, tables, ttl=None):
+        """
+        Caches a 200 response body with its headers (without Content-Length), tagged with tables.
+        """
+        if self.backend is None:
+            return
+        self.backend.set(key, (body, 200, headers), len(body), ttl or self.default_ttl, tables)
+        self._count('stores')
+
+    def invalidate_tables(self, tables):
+        if self.backend is not None:
+            self.backend.invalidate_tags(frozenset(tables))
+            self._count('invalidations')
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'invalidations': self.invalidations,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+        }
+        stats.update(self.backend.stats() if self.backend is not None else {'backend': 'none'})
+        return stats
+
+def create_backend(config):
+    """
+    Builds the backend named by RESPONSE_CACHE_BACKEND ('memory', 'sqlite' or 'none').
+    """
+    name = config.get('RESPONSE_CACHE_BACKEND', 'memory')
+    if name == 'none':
+        return None
+    if name == 'memory':
+        return MemoryCacheBackend(config['RESPONSE_CACHE_MAX_ENTRIES'], config['RESPONSE_CACHE_MAX_BYTES'])
+    if name == 'sqlite':
+        path = config['RESPONSE_CACHE_PATH']
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return SQLiteCacheBackend(path, config['RESPONSE_CACHE_MAX_ENTRIES'], config['RESPONSE_CACHE_MAX_BYTES'])
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {name}")
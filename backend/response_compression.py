@@ -0,0 +1,144 @@
+# backend/response_compression.py
+
+# Negotiated response compression (brotli or gzip) for the JSON, NDJSON, SSE and text
+# responses the API serves.
+#
+# The encoding is picked from the request's Accept-Encoding (highest q-value wins, ties go
+# to the order in COMPRESSION_ALGORITHMS). Buffered responses are compressed in one go when
+# they reach COMPRESSION_MIN_SIZE bytes. Streamed responses (NDJSON exports, the SSE
+# event stream) are compressed chunk by chunk as they are produced, never buffered whole:
+#   - text/event-stream is flushed after every chunk, so each event reaches the client
+#     as soon as it is published;
+#   - other streams are flushed every COMPRESSION_STREAM_FLUSH_BYTES of input, which keeps
+#     the ratio close to whole-body compression while rows keep flowing.
+# Brotli needs the optional `brotli` package (pip install Brotli); without it only gzip is
+# offered. Responses that already carry a Content-Encoding, opt out with
+# Cache-Control: no-transform, or are served by direct passthrough (files) are left alone.
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError: # Optional; gzip is used instead
+    brotli = None
+
+COMPRESSION_ALGORITHMS = ('br', 'gzip')
+COMPRESSIBLE_MIMETYPES = frozenset({'application/json', 'application/x-ndjson', 'application/javascript'})
+EVENT_STREAM_MIMETYPE = 'text/event-stream'
+
+class _GzipEncoder:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31) # wbits 31: gzip container
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+class _BrotliEncoder:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+def _is_compressible(mimetype):
+    return mimetype in COMPRESSIBLE_MIMETYPES or (mimetype or '').startswith('text/')
+
+class ResponseCompression:
+    """
+    Compresses responses according to Accept-Encoding. Call init_app(app) once, last:
+    Flask runs after_request hooks in reverse, so request metrics then record the bytes sent.
+    """
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESSION_ALGORITHMS', ','.join(COMPRESSION_ALGORITHMS))
+        app.config.setdefault('COMPRESSION_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESSION_GZIP_LEVEL', 6)
+        app.config.setdefault('COMPRESSION_BROTLI_LEVEL', 4)
+        app.config.setdefault('COMPRESSION_STREAM_FLUSH_BYTES', 64 * 1024)
+        algorithms = [name.strip() for name in app.config['COMPRESSION_ALGORITHMS'].split(',') if name.strip()]
+        unknown = [name for name in algorithms if name not in COMPRESSION_ALGORITHMS]
+        if unknown:
+            raise ValueError(f"COMPRESSION_ALGORITHMS must be a subset of {COMPRESSION_ALGORITHMS}")
+        if 'br' in algorithms and brotli is None:
+            app.logger.info("brotli is not installed; compressing responses with gzip only.")
+            algorithms.remove('br')
+        self.algorithms = tuple(algorithms)
+        app.after_request(self._after_request)
+
+    def choose_encoding(self, accept_encodings):
+        """
+        Returns the supported encoding the client prefers, or None to send the body as is.
+        """
+        best, best_quality = None, 0
+        for name in self.algorithms:
+            quality = accept_encodings.quality(name)
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    def _encoder(self, encoding):
+        if encoding == 'br':
+            return _BrotliEncoder(current_app.config['COMPRESSION_BROTLI_LEVEL'])
+        return _GzipEncoder(current_app.config['COMPRESSION_GZIP_LEVEL'])
+
+    def _after_request(self, response):
+        if not self.algorithms or not _is_compressible(response.mimetype):
+            return response
+        response.vary.add('Accept-Encoding') # Compressible, so caches must key on it either way
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or response.direct_passthrough or 'Content-Encoding' in response.headers
+                or 'no-transform' in response.cache_control):
+            return response
+        encoding = self.choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            flush_bytes = 0 if response.mimetype == EVENT_STREAM_MIMETYPE else \
+                current_app.config['COMPRESSION_STREAM_FLUSH_BYTES']
+            response.response = self._compress_stream(response.response, self._encoder(encoding), flush_bytes)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < current_app.config['COMPRESSION_MIN_SIZE']:
+                return response
+            encoder = self._encoder(encoding)
+            response.set_data(encoder.compress(body) + encoder.finish())
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True) # The bytes differ from the identity encoding
+        return response
+
+    @staticmethod
+    def _compress_stream(chunks, encoder, flush_bytes):
+        pending = 0
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                data = encoder.compress(chunk)
+                pending += len(chunk)
+                if pending >= flush_bytes:
+                    data += encoder.flush()
+                    pending = 0
+                if data:
+                    yield data
+            yield encoder.finish()
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close() # Lets stream_with_context and teardown hooks run
@@ -0,0 +1,157 @@
+# backend/seed_data.py
+
+# Synthetic data for load testing and benchmarks (`flask seed-data`).
+# Generates categories, locations, users and assets with realistic, skewed distributions:
+# most assets are Active, a minority sit in repair or disposal states, a long tail of users
+# holds most assignments, and warranty expiry dates mix expired, soon-to-expire, far-future
+# and missing values. Rows are written with executemany INSERTs in batches; generated codes
+# start after the current maximum id so existing data is never touched.
+import random
+from datetime import date, timedelta
+
+from sqlalchemy import func, insert
+
+from extensions import db
+from models import Asset, Category, Location, User
+
+SEED_BATCH_SIZE = 5000
+
+CATEGORY_NAMES = (
+    'Laptop', 'Desktop', 'Monitor', 'Printer', 'Scanner', 'Server', 'Network Switch', 'Router',
+    'Firewall', 'Access Point', 'UPS', 'Projector', 'Mobile Phone', 'Tablet', 'Docking Station',
+    'Storage Array', 'Forklift', 'Compressor', 'CNC Machine', 'Welding Unit', 'Air Conditioner',
+    'Refrigeration Unit', 'Office Chair', 'Workstation Desk', 'Vehicle',
+)
+LOCATION_NAMES = tuple(
+    f"{city} {site}"
+    for city in ('Pune', 'Noida', 'Chennai', 'Bengaluru', 'Kolkata', 'Hyderabad', 'Ahmedabad', 'Mumbai')
+    for site in ('Plant 1', 'Plant 2', 'Warehouse', 'Office', 'R&D Centre')
+)
+DEPARTMENTS = ('IT', 'Production', 'Maintenance', 'Quality', 'Logistics', 'Finance', 'HR', 'R&D', 'Sales', 'Admin')
+DIVISIONS = ('Platform', 'Consumer', 'Commercial', 'Components', 'Services')
+MAKES_AND_MODELS = {
+    'Dell': ('Latitude 5440', 'OptiPlex 7010', 'PowerEdge R750', 'P2422H'),
+    'HP': ('EliteBook 840', 'ProDesk 400', 'LaserJet M404', 'Z4 G5'),
+    'Lenovo': ('ThinkPad T14', 'ThinkCentre M70', 'ThinkSystem SR650'),
+    'Cisco': ('Catalyst 9300', 'ISR 4331', 'Meraki MR46'),
+    'APC': ('Smart-UPS 3000', 'Back-UPS 1500'),
+    'Siemens': ('SINUMERIK 828D', 'SIMATIC S7-1500'),
+    'Godrej': ('GX 300', 'Interio Motion'),
+    'Voltas': ('183V DZX', 'Vertis Elite'),
+}
+# (status, weight): the live fleet dominates, disposal states form a tail
+STATUS_WEIGHTS = (
+    ('Active', 70), ('In Repair', 10), ('Pending Scrap Approval', 5), ('Scrapped', 8), ('Disposed', 7),
+)
+FIRST_NAMES = ('Aarav', 'Vivaan', 'Aditya', 'Ananya', 'Diya', 'Ishaan', 'Kavya', 'Meera', 'Rohan', 'Saanvi',
+               'Arjun', 'Neha', 'Pooja', 'Rahul', 'Sneha', 'Vikram', 'Priya', 'Karan', 'Nisha', 'Sameer')
+LAST_NAMES = ('Sharma', 'Verma', 'Patel', 'Iyer', 'Reddy', 'Nair', 'Gupta', 'Joshi', 'Kulkarni', 'Singh',
+              'Das', 'Mehta', 'Rao', 'Chatterjee', 'Deshpande', 'Menon', 'Bose', 'Kapoor', 'Mishra', 'Pillai')
+
+def _get_or_create_names(model, names, detail_field):
+    """
+    Returns {name: id} for the given names, inserting any that are missing.
+    """
+    existing = dict(db.session.query(model.name, model.id).filter(model.name.in_(names)))
+    missing = [name for name in names if name not in existing]
+    if missing:
+        db.session.execute(insert(model), [{'name': name, detail_field: f"Synthetic {name}"} for name in missing])
+        existing = dict(db.session.query(model.name, model.id).filter(model.name.in_(names)))
+    return existing
+
+def _expiry_date(rng, today):
+    """
+    Warranty expiry skewed towards realistic buckets: ~30% expired, ~10% within 90 days,
+    ~55% further out and ~5% unknown.
+    """
+    roll = rng.random()
+    if roll < 0.05:
+        return None
+    if roll < 0.35:
+        return today - timedelta(days=rng.randint(1, 1500))
+    if roll < 0.45:
+        return today + timedelta(days=rng.randint(0, 90))
+    return today + timedelta(days=rng.randint(91, 1800))
+
+def _insert_batches(model, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= SEED_BATCH_SIZE:
+            db.session.execute(insert(model), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(model), batch)
+
+def seed_synthetic_data(assets=200_000, users=20_000, seed=42, assigned_ratio=0.65, log=print):
+    """
+    Inserts `users` users and `assets` assets (plus the category/location catalogue) and
+    commits once. Deterministic for a given seed. Returns a dict of inserted row counts.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    categories = _get_or_create_names(Category, CATEGORY_NAMES, 'description')
+    locations = _get_or_create_names(Location, LOCATION_NAMES, 'address')
+    category_ids = [categories[name] for name in CATEGORY_NAMES]
+    location_ids = [locations[name] for name in LOCATION_NAMES]
+    # A few categories and sites hold most of the fleet
+    category_weights = [1 / (rank + 1) for rank in range(len(category_ids))]
+    location_weights = [1 / (rank + 1) ** 0.7 for rank in range(len(location_ids))]
+
+    user_start = (db.session.query(func.max(User.id)).scalar() or 0) + 1
+    def user_rows():
+        for n in range(user_start, user_start + users):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield {
+                'emp_id': f"SYNE{n:07d}",
+                'emp_code': f"SYNC{n:07d}",
+                'name': f"{first} {last}",
+                'email': f"{first.lower()}.{last.lower()}.{n}@example.com",
+                'role': 'Admin' if rng.random() < 0.01 else 'Employee',
+                'department': rng.choice(DEPARTMENTS),
+                'division': rng.choice(DIVISIONS),
+                'join_date': today - timedelta(days=rng.randint(30, 6000)),
+                'status': 'Active' if rng.random() < 0.93 else 'Inactive',
+                'location': rng.choice(LOCATION_NAMES),
+            }
+    _insert_batches(User, user_rows())
+    user_ids = [user_id for (user_id,) in db.session.query(User.id).filter(User.id >= user_start)]
+    log(f"Inserted {len(user_ids)} users.")
+
+    statuses, status_weights = zip(*STATUS_WEIGHTS)
+    makes = tuple(MAKES_AND_MODELS)
+    asset_start = (db.session.query(func.max(Asset.id)).scalar() or 0) + 1
+    def asset_rows():
+        for n in range(asset_start, asset_start + assets):
+            make = rng.choice(makes)
+            category_id = rng.choices(category_ids, category_weights)[0]
+            capital_date = today - timedelta(days=rng.randint(0, 3650))
+            expiry_date = _expiry_date(rng, today)
+            user_id = None
+            if user_ids and rng.random() < assigned_ratio:
+                # Skewed towards the front of the list: the first 10% of users hold ~46% of assignments
+                user_id = user_ids[int(len(user_ids) * rng.random() ** 3)]
+            yield {
+                'asset_code': f"SYN{n:08d}",
+                'serial_number': f"SN{rng.getrandbits(40):010X}{n}",
+                'capital_date': capital_date,
+                'year': capital_date.year,
+                'asset_type': CATEGORY_NAMES[category_ids.index(category_id)],
+                'asset_description': f"{make} {rng.choice(MAKES_AND_MODELS[make])} for {rng.choice(DEPARTMENTS)}",
+                'make': make,
+                'model': rng.choice(MAKES_AND_MODELS[make]),
+                'status': rng.choices(statuses, status_weights)[0],
+                'department': rng.choice(DEPARTMENTS),
+                'division': rng.choice(DIVISIONS),
+                'plant_code': f"PL{rng.choices(range(len(location_ids)), location_weights)[0]:03d}",
+                'warranty_status': 'Out of Warranty' if expiry_date and expiry_date < today else 'In Warranty',
+                'expiry_date': expiry_date,
+                'category_id': category_id,
+                'location_id': rng.choices(location_ids, location_weights)[0],
+                'user_id': user_id,
+            }
+    _insert_batches(Asset, asset_rows())
+    db.session.commit()
+    log(f"Inserted {assets} assets.")
+    return {'users': len(user_ids), 'assets': assets,
+            'categories': len(category_ids), 'locations': len(location_ids)}
@@ -0,0 +1,60 @@
+# backend/warranty_reconcile.py
+
+# Keeps Asset.warranty_status in step with expiry_date, so warranty filters and counts
+# can use the indexed column instead of re-deriving expiry from dates on every request.
+#
+# One set-based UPDATE per target state moves only the rows whose status is stale:
+#   'Out of Warranty'  expiry_date before today, status anything else
+#   'In Warranty'      expiry_date today or later, status 'Out of Warranty' or empty (e.g. a renewed warranty)
+# Assets without an expiry_date, and manually entered statuses on assets that have not
+# expired yet, are left alone.
+#
+# Where the database supports UPDATE ... RETURNING, the changed ids go to the change log
+# as row upserts; beyond MAX_LOGGED_ROWS (or without RETURNING) the asset table is
+# logged as reset instead, so delta-sync clients refetch it once.
+from datetime import date
+
+from sqlalchemy import and_, or_, update
+
+from change_log import record_row_changes, record_table_reset
+from extensions import db
+from models import Asset
+
+WARRANTY_IN = 'In Warranty'
+WARRANTY_OUT = 'Out of Warranty'
+MAX_LOGGED_ROWS = 1000
+
+def warranty_status_updates(today):
+    """
+    Returns [(status, condition)]: the rows each UPDATE moves to that status.
+    """
+    unset = or_(Asset.warranty_status.is_(None), Asset.warranty_status == '')
+    return [
+        (WARRANTY_OUT, and_(Asset.expiry_date < today,
+                                or_(unset, Asset.warranty_status != WARRANTY_OUT))),
+        (WARRANTY_IN, and_(Asset.expiry_date >= today,
+                           or_(unset, Asset.warranty_status == WARRANTY_OUT))),
+    ]
+
+def reconcile_warranty_status(today=None):
+    """
+    Runs the UPDATEs in the current transaction (the caller commits) and returns
+    {status: rows changed}.
+    """
+    today = today or date.today()
+    returning = db.session.get_bind().dialect.update_returning
+    changed = {}
+    for status, condition in warranty_status_updates(today):
+        stmt = update(Asset).where(condition).values(warranty_status=status).execution_options(
+            synchronize_session=False, change_log=False)
+        if returning:
+            ids = db.session.execute(stmt.returning(Asset.id)).scalars().all()
+            changed[status] = len(ids)
+        else:
+            ids = None
+            changed[status] = db.session.execute(stmt).rowcount
+        if ids is not None and len(ids) <= MAX_LOGGED_ROWS:
+            record_row_changes(db.session, Asset.__tablename__, 'upsert', ids)
+        elif changed[status]:
+            record_table_reset(db.session, Asset.__tablename__)
+    return changed